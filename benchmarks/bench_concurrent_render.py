@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""Benchmark sequential vs. concurrent generation of a single large module.
+
+Usage:
+    python benchmarks/bench_concurrent_render.py [--ports 10000] [--jobs 12] [--repeat 3]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from uvm_gen.generator import TEMPLATES, UVMGenerator
+from uvm_gen.model import ModuleInfo, Parameter, Port
+
+TEMPLATE_DIR = str(Path(__file__).resolve().parent.parent / "uvm_gen" / "templates")
+
+
+def make_module(num_ports: int) -> ModuleInfo:
+    """Build a synthetic module with ``num_ports`` ports of mixed direction and width."""
+    ports = [Port(name="clk", direction="input", width=1)]
+    for i in range(num_ports - 1):
+        direction = "input" if i % 2 == 0 else "output"
+        ports.append(Port(name=f"sig_{i}", direction=direction, width=1 + i % 64))
+    return ModuleInfo(name="wide", ports=ports, params=[Parameter(name="WIDTH", default=8)])
+
+
+def best_of(repeat: int, func) -> float:
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--ports", type=int, default=10000)
+    parser.add_argument("--jobs", type=int, default=min(len(TEMPLATES), os.cpu_count() or 1))
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    module_info = make_module(args.ports)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        generator = UVMGenerator(TEMPLATE_DIR, tmp_dir)
+        # Compile templates and start the worker processes so every mode starts warm
+        generator.generate_testbench(module_info)
+        generator.generate_testbench(module_info, jobs=args.jobs, use_processes=True)
+
+        modes = [
+            ("sequential", dict(jobs=1)),
+            (f"threads x{args.jobs}", dict(jobs=args.jobs, use_processes=False)),
+            (f"processes x{args.jobs}", dict(jobs=args.jobs, use_processes=True)),
+        ]
+        baseline = None
+        print(f"{args.ports} ports, {len(TEMPLATES)} templates, best of {args.repeat}")
+        for label, kwargs in modes:
+            elapsed = best_of(args.repeat, lambda: generator.generate_testbench(module_info, **kwargs))
+            baseline = baseline or elapsed
+            print(f"  {label:<16} {elapsed * 1000:9.1f} ms  {baseline / elapsed:5.2f}x")
+        generator.close()
+
+
+if __name__ == "__main__":
+    main()
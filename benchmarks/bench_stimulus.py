@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""Benchmark offline NumPy stimulus generation against per-transaction randomization.
+
+The baseline draws every port of every vector individually, which is how the
+default ``<name>_sequence`` works: one ``randomize()`` call per transaction.
+It is measured in Python here. The simulator-side cost of ``randomize()`` is
+usually higher still. To measure it, run the generated test once with the
+default sequence and once with
+``+uvm_set_type_override=<name>_sequence,<name>_file_sequence``.
+
+Usage:
+    python benchmarks/bench_stimulus.py [--vectors 1000000]
+"""
+
+import argparse
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from uvm_gen.model import ModuleInfo, Port
+from uvm_gen.stimulus import record_bytes, write_stimulus
+
+MODULES = {
+    "adder (2x8 bit)": ModuleInfo("adder", [
+        Port("a", "input", 8), Port("b", "input", 8), Port("sum", "output", 9),
+    ], []),
+    "datapath (clk + 6 inputs, 56 bit)": ModuleInfo("datapath", [
+        Port("clk", "input"), Port("rst_n", "input"), Port("valid", "input"),
+        Port("op", "input", 4), Port("a", "input", 16), Port("b", "input", 16),
+        Port("mask", "input", 18), Port("y", "output", 32),
+    ], []),
+    "wide bus (4x128 bit)": ModuleInfo("wide", [
+        Port(f"lane{i}", "input", 128) for i in range(4)
+    ], []),
+}
+
+
+def per_transaction(module_info: ModuleInfo, count: int, path: str):
+    """Draw and pack each vector on its own, like one randomize() per transaction."""
+    ports = module_info.driven_ports
+    num_bytes = record_bytes(module_info)
+    rng = random.Random(1)
+    with open(path, "wb") as f:
+        for _ in range(count):
+            value = 0
+            for port in ports:
+                value = (value << port.width) | rng.getrandbits(port.width)
+            f.write(value.to_bytes(num_bytes, "big"))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--vectors", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = str(Path(tmp_dir) / "stim.bin")
+        print(f"{args.vectors} vectors per run")
+        for label, module_info in MODULES.items():
+            start = time.perf_counter()
+            write_stimulus(path, module_info, args.vectors, seed=1)
+            vectorized = args.vectors / (time.perf_counter() - start)
+
+            baseline_count = max(1, args.vectors // 10)
+            start = time.perf_counter()
+            per_transaction(module_info, baseline_count, path)
+            baseline = baseline_count / (time.perf_counter() - start)
+
+            print(f"  {label:<34} numpy {vectorized / 1e6:7.2f} M vec/s   "
+                  f"per-transaction {baseline / 1e6:6.2f} M vec/s   {vectorized / baseline:6.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,40 @@
+module datapath
+(
+    input  [7:0] a,
+    input  [7:0] b,
+    output [8:0] sum0,
+    output [8:0] sum1
+);
+
+    // Two adders sharing the same operands
+    adder u_add0 (.a(a), .b(b), .sum(sum0));
+    adder u_add1 (
+        .a(b),
+        .b(a),
+        .sum(sum1)
+    );
+
+endmodule
+
+module soc
+(
+    input  clk,
+    input  rst_n,
+    input  [7:0] a,
+    input  [7:0] b,
+    output [7:0] data_out
+);
+
+    wire [8:0] sum0, sum1;
+
+    datapath u_dp (.a(a), .b(b), .sum0(sum0), .sum1(sum1));
+
+    /* fsm u_commented (...); */
+    fsm #(.STATES(4), .WIDTH(8)) u_ctrl (
+        .clk(clk),
+        .rst_n(rst_n),
+        .data_in(sum0[7:0]),
+        .data_out(data_out)
+    );
+
+endmodule
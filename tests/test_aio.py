@@ -0,0 +1,75 @@
+"""Tests for the asyncio API."""
+import asyncio
+import os
+from pathlib import Path
+
+import pytest
+
+from uvm_gen.aio import AsyncUVMGenerator, async_parse_rtl
+from uvm_gen.generator import UVMGenerator
+from uvm_gen.parser import parse_rtl
+
+TEMPLATE_DIR = str(Path(__file__).parent.parent / "uvm_gen" / "templates")
+RTL_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'rtl', 'fsm.sv')
+
+
+def test_async_parse_rtl():
+    """Test that async parsing matches the synchronous parser."""
+    assert asyncio.run(async_parse_rtl(RTL_PATH)) == parse_rtl(RTL_PATH)
+    with pytest.raises(RuntimeError, match="File not found"):
+        asyncio.run(async_parse_rtl("nonexistent.sv"))
+
+
+def test_async_generate_matches_sync(tmp_path):
+    """Test that async generation returns and writes the same files."""
+    module_info = parse_rtl(RTL_PATH)
+    sync_files = UVMGenerator(TEMPLATE_DIR, str(tmp_path / "sync")).generate_testbench(module_info)
+
+    async def run():
+        generator = AsyncUVMGenerator(TEMPLATE_DIR, str(tmp_path / "async"), max_concurrency=2)
+        # Two modules in flight on the same generator share its concurrency limit
+        return await asyncio.gather(
+            generator.generate_testbench(module_info),
+            generator.generate_testbench(module_info, output_dir=str(tmp_path / "other")),
+        )
+
+    async_files, other_files = asyncio.run(run())
+    assert [Path(f).name for f in async_files] == [Path(f).name for f in sync_files]
+    assert [Path(f).parent.name for f in other_files] == ["other"] * len(sync_files)
+    for sync_file, async_file in zip(sync_files, async_files):
+        assert Path(sync_file).read_text() == Path(async_file).read_text()
+
+
+def test_async_generator_reused_across_loops(tmp_path):
+    """Test that one instance works under successive event loops."""
+    module_info = parse_rtl(RTL_PATH)
+    generator = AsyncUVMGenerator(TEMPLATE_DIR, str(tmp_path), max_concurrency=2)
+    first = asyncio.run(generator.generate_testbench(module_info))
+    second = asyncio.run(generator.generate_testbench(module_info, output_dir=str(tmp_path / "again")))
+    assert [Path(f).name for f in first] == [Path(f).name for f in second]
+
+
+def test_async_generate_error(tmp_path):
+    """Test that a failing template surfaces as RuntimeError."""
+    module_info = parse_rtl(RTL_PATH)
+    generator = AsyncUVMGenerator(str(tmp_path), str(tmp_path / "out"))
+    with pytest.raises(RuntimeError, match="Failed to generate") as excinfo:
+        asyncio.run(generator.generate_testbench(module_info))
+    # Every missing template is reported, as by the synchronous generator
+    message = str(excinfo.value)
+    assert all(f"Failed to generate {name}" in message for name in generator.generator.templates)
+
+
+def test_async_generate_cancel(tmp_path):
+    """Test that cancelling generation propagates to the caller."""
+    module_info = parse_rtl(RTL_PATH)
+
+    async def run():
+        generator = AsyncUVMGenerator(TEMPLATE_DIR, str(tmp_path), max_concurrency=1)
+        task = asyncio.ensure_future(generator.generate_testbench(module_info))
+        await asyncio.sleep(0)
+        task.cancel()
+        await task
+
+    with pytest.raises(asyncio.CancelledError):
+        asyncio.run(run())
@@ -1,5 +1,8 @@
 """Tests for the command-line interface.""" 
 
+import json
+
+import pytest
 from click.testing import CliRunner
 from uvm_gen.cli import main
 import shutil
@@ -38,4 +41,208 @@ def test_readonly_directory(tmp_path):
     # Should fail with a permission error
     assert result.exit_code != 0
     assert result.exception is not None
-    assert "Permission denied" in str(result.exception) 
\ No newline at end of file
+    assert "Permission denied" in str(result.exception) 
+
+def test_cli_shard_and_merge(tmp_path):
+    """Test sharded generation followed by a manifest merge."""
+    test_dir = os.path.dirname(os.path.abspath(__file__))
+    rtl = [os.path.join(test_dir, 'rtl', name) for name in ('adder.sv', 'fsm.sv')]
+    args = [a for path in rtl for a in ("--rtl", path)]
+    out = tmp_path / "tb"
+    runner = CliRunner()
+    for index in range(2):
+        result = runner.invoke(main, args + ["--out", str(out), "--shard", f"{index}/2", "--shard-by-size"])
+        assert result.exit_code == 0, result.output
+    assert (out / "adder_agent.sv").exists()
+    assert (out / "fsm_agent.sv").exists()
+
+    manifests = [str(out / f"manifest-shard-{i}-of-2.json") for i in range(2)]
+    merge_args = [a for path in manifests for a in ("--merge", path)]
+    result = runner.invoke(main, merge_args + ["--out", str(tmp_path / "report")])
+    assert result.exit_code == 0, result.output
+    assert (tmp_path / "report" / "merged_manifest.json").exists()
+
+    result = runner.invoke(main, ["--merge", manifests[0], "--out", str(tmp_path / "report")])
+    assert result.exit_code != 0
+    assert "missing" in result.output
+
+    # Bad manifests are reported as errors, not tracebacks
+    (tmp_path / "bad.json").write_text('{"version": 99}')
+    result = runner.invoke(main, ["--merge", manifests[0], "--merge", str(tmp_path / "bad.json"),
+                                  "--out", str(tmp_path / "report")])
+    assert result.exit_code == 1
+    assert "Unsupported manifest version 99" in result.output
+
+
+def test_cli_param_sweep(tmp_path):
+    """Test generating one variant per parameter value."""
+    test_dir = os.path.dirname(os.path.abspath(__file__))
+    rtl = os.path.join(test_dir, 'rtl', 'fsm.sv')
+    out = tmp_path / "tb"
+    runner = CliRunner()
+    result = runner.invoke(main, ["--rtl", rtl, "--out", str(out), "-p", "WIDTH=8,16", "-p", "STATES=4"])
+    assert result.exit_code == 0, result.output
+    assert (out / "WIDTH_8__STATES_4" / "fsm_agent.sv").exists()
+    assert (out / "WIDTH_16__STATES_4" / "fsm_agent.sv").exists()
+
+
+def test_cli_param_sweep_derived(tmp_path):
+    """Test sweeping a module whose port ranges use derived parameters."""
+    rtl = tmp_path / "ram.sv"
+    rtl.write_text("module ram #(parameter DEPTH = 16, parameter AW = $clog2(DEPTH)) (\n"
+                   "    input clk,\n    input [AW-1:0] addr,\n    input [N-1:0] data\n);\nendmodule\n")
+    runner = CliRunner()
+    result = runner.invoke(main, ["--rtl", str(rtl), "--out", str(tmp_path / "tb"), "-p", "DEPTH=16,256"])
+    # N is not a parameter, so the sweep is rejected before anything is written
+    assert result.exit_code == 2
+    assert "Cannot sweep module ram: Unknown parameter N" in result.output
+    assert not (tmp_path / "tb").exists()
+
+    rtl.write_text(rtl.read_text().replace("[N-1:0]", "[7:0]"))
+    result = runner.invoke(main, ["--rtl", str(rtl), "--out", str(tmp_path / "tb"), "-p", "DEPTH=16,256"])
+    assert result.exit_code == 0, result.output
+    assert "logic [7:0] addr;" in (tmp_path / "tb" / "DEPTH_256" / "ram_interface.sv").read_text()
+
+
+def test_cli_param_sweep_batch(tmp_path):
+    """Test that a sweep only applies to the modules declaring its parameters."""
+    test_dir = os.path.dirname(os.path.abspath(__file__))
+    rtl = [os.path.join(test_dir, 'rtl', name) for name in ('adder.sv', 'fsm.sv')]
+    out = tmp_path / "tb"
+    runner = CliRunner()
+    result = runner.invoke(main, ["--rtl", rtl[0], "--rtl", rtl[1], "--out", str(out),
+                                  "-p", "WIDTH=8,16", "-p", "NOPE=1"])
+    assert result.exit_code == 0, result.output
+    assert (out / "adder_agent.sv").exists()
+    assert (out / "WIDTH_8" / "fsm_agent.sv").exists()
+    assert (out / "WIDTH_16" / "fsm_agent.sv").exists()
+    assert "no module declares parameter(s) NOPE" in result.output
+
+
+def test_cli_hierarchy(tmp_path):
+    """Test hierarchical generation across several RTL files."""
+    test_dir = os.path.dirname(os.path.abspath(__file__))
+    args = []
+    for name in ('soc.sv', 'adder.sv', 'fsm.sv'):
+        args += ["--rtl", os.path.join(test_dir, 'rtl', name)]
+    out = tmp_path / "tb"
+    runner = CliRunner()
+    result = runner.invoke(main, args + ["--out", str(out), "--hierarchy"])
+    assert result.exit_code == 0, result.output
+    assert (out / "soc_top_env.sv").exists()
+    assert (out / "adder_agent.sv").exists()
+
+
+def test_cli_model_round_trip(tmp_path):
+    """Test exporting parsed modules and generating from the export."""
+    test_dir = os.path.dirname(os.path.abspath(__file__))
+    args = []
+    for name in ('adder.sv', 'fsm.sv'):
+        args += ["--rtl", os.path.join(test_dir, 'rtl', name)]
+    model = str(tmp_path / "model.bin")
+    runner = CliRunner()
+    result = runner.invoke(main, args + ["--out", str(tmp_path / "from_rtl"), "--dump-model", model])
+    assert result.exit_code == 0, result.output
+
+    result = runner.invoke(main, ["--from-model", model, "--out", str(tmp_path / "from_model")])
+    assert result.exit_code == 0, result.output
+    for name in ("adder_interface.sv", "fsm_driver.sv"):
+        assert (tmp_path / "from_model" / name).read_text() == (tmp_path / "from_rtl" / name).read_text()
+
+    result = runner.invoke(main, ["--from-model", model, "--rtl", args[1], "--out", str(tmp_path)])
+    assert result.exit_code != 0
+
+
+def test_cli_stimulus(tmp_path):
+    """Test writing stimulus vectors alongside a file-driven sequence."""
+    pytest.importorskip("numpy")
+    test_dir = os.path.dirname(os.path.abspath(__file__))
+    out = tmp_path / "tb"
+    runner = CliRunner()
+    result = runner.invoke(main, ["--rtl", os.path.join(test_dir, 'rtl', 'adder.sv'), "--out", str(out),
+                                  "--stimulus", "100", "--stim-seed", "1"])
+    assert result.exit_code == 0, result.output
+    assert (out / "adder_stim.bin").stat().st_size == 16 + 100 * 2
+    assert "RECORD_BYTES = 2;" in (out / "adder_file_sequence.sv").read_text()
+    assert '`include "adder_file_sequence.sv"' in (out / "adder_pkg.sv").read_text()
+
+
+def test_cli_stimulus_batch_constraints(tmp_path):
+    """Test that constraints apply per module and bad ones are usage errors."""
+    pytest.importorskip("numpy")
+    test_dir = os.path.dirname(os.path.abspath(__file__))
+    args = ["--rtl", os.path.join(test_dir, 'rtl', 'adder.sv'),
+            "--rtl", os.path.join(test_dir, 'rtl', 'fsm.sv'), "--stimulus", "10"]
+    constraints = tmp_path / "constraints.json"
+    constraints.write_text(json.dumps({"a": {"max": 3}, "data_in": {"values": [5]}, "nope": {"min": 1}}))
+    runner = CliRunner()
+    result = runner.invoke(main, args + ["--out", str(tmp_path / "tb"), "--stim-constraints", str(constraints)])
+    assert result.exit_code == 0, result.output
+    assert (tmp_path / "tb" / "adder_stim.bin").exists()
+    assert (tmp_path / "tb" / "fsm_stim.bin").exists()
+    assert "no module drives constrained input(s) nope" in result.output
+
+    constraints.write_text(json.dumps({"a": {"max": 300}}))
+    result = runner.invoke(main, args + ["--out", str(tmp_path / "bad"), "--stim-constraints", str(constraints)])
+    assert result.exit_code == 2
+    assert "does not fit 8-bit port a" in result.output
+    assert not (tmp_path / "bad" / "adder_file_sequence.sv").exists()
+
+    constraints.write_text("{not json")
+    result = runner.invoke(main, args + ["--out", str(tmp_path / "bad"), "--stim-constraints", str(constraints)])
+    assert result.exit_code == 2
+    assert "invalid JSON" in result.output
+
+
+def test_cli_stimulus_without_inputs(tmp_path):
+    """Test that --stimulus rejects a module with nothing to drive before rendering."""
+    rtl = tmp_path / "source.sv"
+    rtl.write_text("module source(input clk, output [7:0] q);\nendmodule\n")
+    out = tmp_path / "tb"
+    runner = CliRunner()
+    result = runner.invoke(main, ["--rtl", str(rtl), "--out", str(out), "--stimulus", "10"])
+    assert result.exit_code == 2
+    assert "module source has no inputs to drive" in result.output
+    assert not (out / "source_file_sequence.sv").exists()
+
+
+def test_cli_hierarchy_manifest_merges(tmp_path):
+    """Test that a hierarchy manifest records every module under its own source."""
+    test_dir = os.path.dirname(os.path.abspath(__file__))
+    rtl = [os.path.join(test_dir, 'rtl', name) for name in ('soc.sv', 'adder.sv', 'fsm.sv')]
+    out = tmp_path / "tb"
+    manifest = tmp_path / "hier.json"
+    args = [a for path in rtl for a in ("--rtl", path)]
+    runner = CliRunner()
+    result = runner.invoke(main, args + ["--out", str(out), "--hierarchy", "--manifest", str(manifest)])
+    assert result.exit_code == 0, result.output
+    modules = json.loads(manifest.read_text())["modules"]
+    assert {m["module"]: m["input"] for m in modules} == {
+        "adder": rtl[1], "datapath": rtl[0], "fsm": rtl[2], "soc": rtl[0]}
+    result = runner.invoke(main, ["--out", str(tmp_path / "merged"), "--merge", str(manifest)])
+    assert result.exit_code == 0, result.output
+
+
+
+def test_cli_hierarchy_dump_model(tmp_path):
+    """Test that --dump-model writes every elaborated module with --hierarchy."""
+    test_dir = os.path.dirname(os.path.abspath(__file__))
+    args = [a for name in ('soc.sv', 'adder.sv', 'fsm.sv')
+            for a in ("--rtl", os.path.join(test_dir, 'rtl', name))]
+    model = tmp_path / "model.jsonl"
+    runner = CliRunner()
+    result = runner.invoke(main, args + ["--out", str(tmp_path / "tb"), "--hierarchy",
+                                         "--dump-model", str(model)])
+    assert result.exit_code == 0, result.output
+    names = [json.loads(line)["name"] for line in model.read_text().splitlines()]
+    assert sorted(names) == ["adder", "datapath", "fsm", "soc"]
+
+
+def test_cli_invalid_valid_cond(tmp_path):
+    """Test that a condition naming a missing port is rejected before rendering."""
+    runner = CliRunner()
+    result = runner.invoke(main, ["--rtl", "tests/rtl/fsm.sv", "--out", str(tmp_path / "tb"),
+                                  "--valid-cond", "vaild && rst_n"])
+    assert result.exit_code == 2
+    assert "unknown port(s) of module fsm: vaild" in result.output
+    assert not (tmp_path / "tb" / "fsm_monitor.sv").exists()
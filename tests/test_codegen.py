@@ -1 +1,22 @@
-"""Tests for the code generation module.""" 
\ No newline at end of file
+"""Tests for the code generation module."""
+
+from uvm_gen.codegen import CodeGenerator
+from uvm_gen.generator import TEMPLATES
+from uvm_gen.model import ModuleInfo, Port
+
+
+def test_render_shares_one_generator(tmp_path):
+    """Test that every module is rendered by the same compiled generator."""
+    gen = CodeGenerator()
+    generator = gen.generator
+    try:
+        for name in ("first", "second"):
+            module = ModuleInfo(name=name, ports=[Port(name="a", direction="input", width=4)],
+                                params=[])
+            files = gen.render(module, str(tmp_path / name), jobs=2)
+            assert len(files) == len(TEMPLATES)
+            assert (tmp_path / name / f"{name}_agent.sv").exists()
+        assert gen.generator is generator
+    finally:
+        gen.close()
+    assert generator._process_pool is None
@@ -56,6 +56,7 @@ def test_generate_testbench(generator, module_info):
         "test_module_interface.sv",
         "test_module_config.sv",
         "test_module_pkg.sv",
+        "test_module_monitor.sv",
     ]
     
     assert len(generated_files) == len(expected_files)
@@ -136,4 +137,88 @@ endclass
     agent_file = tmp_path / "output" / "adder_agent.sv"
     assert agent_file.exists()
     content = agent_file.read_text()
-    assert "Custom agent implementation" in content 
\ No newline at end of file
+    assert "Custom agent implementation" in content 
+
+@pytest.mark.parametrize("use_processes", [False, True])
+def test_concurrent_generation_matches_sequential(module_info, tmp_path, use_processes):
+    """Test that concurrent rendering writes the same files in the same order."""
+    template_dir = Path(__file__).parent.parent / "uvm_gen" / "templates"
+    generator = UVMGenerator(str(template_dir), str(tmp_path / "seq"))
+    try:
+        sequential = generator.generate_testbench(module_info)
+        concurrent = generator.generate_testbench(
+            module_info, output_dir=str(tmp_path / "par"), jobs=4, use_processes=use_processes
+        )
+    finally:
+        generator.close()
+    assert [Path(f).name for f in concurrent] == [Path(f).name for f in sequential]
+    for seq_file, par_file in zip(sequential, concurrent):
+        assert Path(seq_file).read_text() == Path(par_file).read_text()
+
+
+@pytest.mark.parametrize("jobs", [1, 4])
+def test_generation_reports_every_failed_template(module_info, tmp_path, jobs):
+    """Test that all failing templates are reported, not just the first."""
+    custom_templates = tmp_path / "templates"
+    custom_templates.mkdir()
+    default_templates = Path(__file__).parent.parent / "uvm_gen" / "templates"
+    for template_file in default_templates.glob("*.j2"):
+        shutil.copy(template_file, custom_templates / template_file.name)
+    (custom_templates / "driver.sv.j2").write_text("{{ module.name | no_such_filter }}")
+    (custom_templates / "config.sv.j2").unlink()
+
+    generator = UVMGenerator(str(custom_templates), str(tmp_path / "out"))
+    with pytest.raises(RuntimeError) as excinfo:
+        generator.generate_testbench(module_info, jobs=jobs)
+    message = str(excinfo.value)
+    assert "Failed to generate driver.sv.j2" in message
+    assert "Failed to generate config.sv.j2" in message
+    # Templates that did render are still written
+    assert (tmp_path / "out" / "test_module_agent.sv").exists()
+
+
+def test_clocking_blocks_and_monitor(module_info, tmp_path):
+    """Test packed-bus driving and handshake-gated monitor sampling."""
+    template_dir = Path(__file__).parent.parent / "uvm_gen" / "templates"
+    module_info.ports.append(Port(name="valid", direction="output", width=1))
+    generator = UVMGenerator(str(template_dir), str(tmp_path), valid_condition="valid && data_out != 8'h0",
+                             input_skew="2ns", output_skew="1ns")
+    generator.generate_testbench(module_info)
+
+    interface = (tmp_path / "test_module_interface.sv").read_text()
+    assert "interface test_module_if(input logic clk);" in interface
+    assert "clocking drv_cb @(posedge clk);" in interface
+    assert "default input #2ns output #1ns;" in interface
+    assert "assign data_in = in_bus.data_in;" in interface
+    assert "logic [0:0] clk;" not in interface
+    # Only the ports named in the valid condition get their own clockvar
+    start = interface.index("clocking mon_cb")
+    mon_cb = interface[start:interface.index("endclocking", start)]
+    assert [line.strip() for line in mon_cb.splitlines() if line.strip().startswith("input ")] == [
+        "input in_bus;", "input out_bus;", "input data_out;", "input valid;"]
+
+    driver = (tmp_path / "test_module_driver.sv").read_text()
+    assert "@(vif.drv_cb);" in driver
+    assert driver.count("<=") == 1
+
+    transaction = (tmp_path / "test_module_transaction.sv").read_text()
+    assert "function logic [8:0] pack_inputs();" in transaction
+    assert "return { rst_n, data_in };" in transaction
+
+    monitor = (tmp_path / "test_module_monitor.sv").read_text()
+    assert "if (vif.mon_cb.valid && vif.mon_cb.data_out != 8'h0) begin" in monitor
+    assert "tr.unpack_outputs(vif.mon_cb.out_bus);" in monitor
+
+
+def test_valid_condition_checked(module_info, tmp_path):
+    """Test that a valid condition may only name the module's non-clock ports."""
+    template_dir = str(Path(__file__).parent.parent / "uvm_gen" / "templates")
+    with pytest.raises(RuntimeError, match="does not name any port"):
+        UVMGenerator(template_dir, str(tmp_path), valid_condition="1'b1")
+    generator = UVMGenerator(template_dir, str(tmp_path), valid_condition="vaild && data_out")
+    with pytest.raises(RuntimeError, match="unknown port\\(s\\) of module test_module: vaild"):
+        generator.generate_testbench(module_info)
+    generator = UVMGenerator(template_dir, str(tmp_path), valid_condition="clk && rst_n")
+    with pytest.raises(RuntimeError, match="cannot use the clock port clk"):
+        generator.generate_testbench(module_info)
+    assert list(tmp_path.iterdir()) == []
@@ -0,0 +1,114 @@
+"""Tests for the instantiation graph and hierarchical generation."""
+import os
+
+import pytest
+
+from uvm_gen.generator import TEMPLATES
+from uvm_gen.hierarchy import TOP_TEMPLATES, build_graph, generate_hierarchy
+from uvm_gen.model import Instance
+
+
+@pytest.fixture
+def rtl_files():
+    """Return the RTL files making up the test SoC."""
+    test_dir = os.path.dirname(os.path.abspath(__file__))
+    return [os.path.join(test_dir, 'rtl', name) for name in ('soc.sv', 'adder.sv', 'fsm.sv')]
+
+
+def test_build_graph(rtl_files):
+    """Test that instantiations are resolved across files."""
+    graph = build_graph(rtl_files)
+    assert sorted(graph.modules) == ["adder", "datapath", "fsm", "soc"]
+    assert graph.instances["soc"] == [Instance("datapath", "u_dp"), Instance("fsm", "u_ctrl")]
+    assert graph.instances["datapath"] == [Instance("adder", "u_add0"), Instance("adder", "u_add1")]
+    assert graph.instances["adder"] == []
+    assert graph.tops() == ["soc"]
+    assert graph.subtree("soc") == ["adder", "datapath", "fsm", "soc"]
+    assert [p.name for p in graph.modules["soc"].ports] == ["clk", "rst_n", "a", "b", "data_out"]
+
+
+def test_non_ansi_ports(tmp_path):
+    """Test that Verilog-2001 port declarations in the module body are found."""
+    rtl = tmp_path / "legacy.sv"
+    rtl.write_text("module leaf(a, y);\n  input [3:0] a;\n  output y;\n  assign y = ^a;\nendmodule\n"
+                   "module top(x, z);\n  input [3:0] x;\n  output z;\n  leaf u_leaf(.a(x), .y(z));\n"
+                   "endmodule\n")
+    graph = build_graph([str(rtl)])
+    leaf = graph.modules["leaf"]
+    assert [(p.name, p.direction, p.width) for p in leaf.ports] == [("a", "input", 4), ("y", "output", 1)]
+    assert [p.name for p in graph.modules["top"].ports] == ["x", "z"]
+    assert graph.instances["top"] == [Instance("leaf", "u_leaf")]
+
+
+def test_instance_list(tmp_path):
+    """Test that every instance of a comma-separated list is recorded."""
+    rtl = tmp_path / "list.sv"
+    rtl.write_text("module leaf(input a, output y); endmodule\n"
+                   "module top(input [2:0] x, output [2:0] z);\n"
+                   "  leaf #(.W(1)) u0 (.a(x[0]), .y(z[0])),\n"
+                   "                u1 (.a(x[1]), .y(z[1])), u2[1:0] (.a(x[2]), .y(z[2]));\n"
+                   "endmodule\n")
+    graph = build_graph([str(rtl)])
+    assert graph.instances["top"] == [Instance("leaf", "u0"), Instance("leaf", "u1"),
+                                      Instance("leaf", "u2")]
+    generate_hierarchy(graph, "top", str(tmp_path))
+    assert "leaf_agent u1;" in (tmp_path / "top_top_env.sv").read_text()
+
+
+def test_recursive_instantiation(tmp_path):
+    """Test that recursive hierarchies are rejected."""
+    rtl = tmp_path / "loop.sv"
+    rtl.write_text("module a(input x); b u_b(.x(x)); endmodule\n"
+                   "module b(input x); a u_a(.x(x)); endmodule\n")
+    graph = build_graph([str(rtl)])
+    with pytest.raises(RuntimeError, match="Recursive instantiation"):
+        graph.subtree("a")
+
+
+def test_duplicate_module(tmp_path, rtl_files):
+    """Test that a module defined twice is reported."""
+    copy = tmp_path / "adder_copy.sv"
+    copy.write_text(open(rtl_files[1]).read())
+    with pytest.raises(RuntimeError, match="defined in both"):
+        build_graph(rtl_files + [str(copy)])
+
+
+def test_generate_hierarchy(rtl_files, tmp_path):
+    """Test that every block is generated and composed into top envs."""
+    graph = build_graph(rtl_files)
+    generated = generate_hierarchy(graph, "soc", str(tmp_path), jobs=4)
+    assert list(generated) == ["adder", "datapath", "fsm", "soc"]
+    files = [f for module_files in generated.values() for f in module_files]
+    assert len(files) == 4 * len(TEMPLATES) + 2 * len(TOP_TEMPLATES)
+    soc_env = (tmp_path / "soc_top_env.sv").read_text()
+    assert "datapath_top_env u_dp;" in soc_env
+    assert "fsm_agent u_ctrl;" in soc_env
+    dp_env = (tmp_path / "datapath_top_env.sv").read_text()
+    assert 'u_add1 = adder_agent::type_id::create("u_add1", this);' in dp_env
+    assert 'uvm_config_db #(adder_config)::set(this, "u_add0*", "config", u_add0_cfg);' in dp_env
+    assert not (tmp_path / "adder_top_env.sv").exists()
+
+
+def test_top_pkg_imports(rtl_files, tmp_path):
+    """Test that each top env is compiled in a package importing its sub-blocks."""
+    graph = build_graph(rtl_files)
+    generate_hierarchy(graph, "soc", str(tmp_path))
+    soc_pkg = (tmp_path / "soc_top_pkg.sv").read_text()
+    assert "package soc_top_pkg;" in soc_pkg
+    assert "import datapath_top_pkg::*;" in soc_pkg
+    assert "import fsm_pkg::*;" in soc_pkg
+    assert '`include "soc_top_env.sv"' in soc_pkg
+    dp_pkg = (tmp_path / "datapath_top_pkg.sv").read_text()
+    assert dp_pkg.count("import adder_pkg::*;") == 1
+    assert not (tmp_path / "adder_top_pkg.sv").exists()
+
+
+def test_shared_subtrees_generated_once(rtl_files, tmp_path):
+    """Test that modules shared by several tops are generated only once."""
+    graph = build_graph(rtl_files)
+    timings = {}
+    generated = generate_hierarchy(graph, ["datapath", "soc"], str(tmp_path), timings=timings)
+    assert list(generated) == ["adder", "datapath", "fsm", "soc"]
+    files = [f for module_files in generated.values() for f in module_files]
+    assert len(files) == len(set(files))
+    assert set(timings) == set(generated)
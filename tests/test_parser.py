@@ -227,4 +227,46 @@ def test_unsupported_ast_node():
     rtl_path = os.path.join(test_dir, 'rtl', 'unsupported.sv')
     
     with pytest.raises(RuntimeError, match="Unsupported AST node type"):
-        parse_rtl(rtl_path) 
\ No newline at end of file
+        parse_rtl(rtl_path) 
+
+def test_width_expression_recorded(tmp_path):
+    """Test that port ranges are recorded and can be re-evaluated."""
+    from uvm_gen.parser import evaluate_width
+    rtl = '''
+module ram #(parameter WIDTH = 8, parameter DEPTH = 16) (
+    input [WIDTH-1:0] wdata,
+    input [$clog2(DEPTH)-1:0] addr,
+    input we
+);
+endmodule
+'''
+    rtl_path = tmp_path / "ram.sv"
+    rtl_path.write_text(rtl)
+    module_info = parse_rtl(str(rtl_path))
+    exprs = {port.name: port.width_expr for port in module_info.ports}
+    assert exprs == {"wdata": "WIDTH-1:0", "addr": "$clog2(DEPTH)-1:0", "we": None}
+    assert evaluate_width("WIDTH-1:0", {"WIDTH": 24}) == 24
+    assert evaluate_width("$clog2(DEPTH)-1:0", {"DEPTH": 1000}) == 10
+    assert evaluate_width("4'd7:0", {}) == 8
+    with pytest.raises(RuntimeError, match="Unknown parameter"):
+        evaluate_width("WIDTH-1:0", {})
+
+
+def test_derived_parameter_defaults(tmp_path):
+    """Test that non-literal defaults are evaluated and their expressions kept."""
+    rtl = '''
+module fifo #(parameter WIDTH = 8, parameter int AW = $clog2(WIDTH), DEPTH = 1 << AW,
+              parameter string MODE = "fast") (
+    input [AW-1:0] addr
+);
+endmodule
+'''
+    rtl_path = tmp_path / "fifo.sv"
+    rtl_path.write_text(rtl)
+    module_info = parse_rtl(str(rtl_path))
+    assert module_info.params == [
+        Parameter(name="WIDTH", default=8),
+        Parameter(name="AW", default=3, expr="$clog2(WIDTH)"),
+        Parameter(name="DEPTH", default=8, expr="1 << AW"),
+        Parameter(name="MODE", default='"fast"', expr='"fast"'),
+    ]
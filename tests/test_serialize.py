@@ -0,0 +1,106 @@
+"""Tests for ModuleInfo import and export."""
+import json
+
+import pytest
+
+from uvm_gen.model import ModuleInfo, Parameter, Port
+from uvm_gen.serialize import (
+    BINARY_MAGIC,
+    module_from_bytes,
+    module_from_dict,
+    module_to_bytes,
+    module_to_dict,
+    read_modules,
+    write_modules,
+)
+
+
+@pytest.fixture
+def modules():
+    """Create a few modules covering every field."""
+    return [
+        ModuleInfo(
+            name=f"block_{i}",
+            ports=[
+                Port(name="clk", direction="input"),
+                Port(name="data", direction="input", width=8 + i, width_expr="WIDTH-1:0"),
+                Port(name="bus", direction="inout", width=4),
+                Port(name="q", direction="output", width=8),
+            ],
+            params=[Parameter(name="WIDTH", default=8 + i), Parameter(name="MODE", default="fast"),
+                    Parameter(name="AW", default=3, expr="$clog2(WIDTH)")],
+        )
+        for i in range(3)
+    ]
+
+
+@pytest.mark.parametrize("binary", [False, True])
+def test_round_trip(modules, tmp_path, binary):
+    """Test that modules survive a write/read cycle in both formats."""
+    path = str(tmp_path / ("model.bin" if binary else "model.jsonl"))
+    assert write_modules(iter(modules), path, binary=binary) == len(modules)
+    assert list(read_modules(path)) == modules
+    assert (open(path, "rb").read(len(BINARY_MAGIC)) == BINARY_MAGIC) == binary
+
+
+def test_read_is_incremental(modules, tmp_path):
+    """Test that modules are yielded before a later bad record is reached."""
+    path = tmp_path / "model.jsonl"
+    lines = [json.dumps(module_to_dict(m)) for m in modules[:2]] + ["", "{not json"]
+    path.write_text("\n".join(lines) + "\n")
+    reader = read_modules(str(path))
+    assert next(reader) == modules[0]
+    assert next(reader) == modules[1]
+    with pytest.raises(RuntimeError, match="model.jsonl:4"):
+        next(reader)
+
+
+def test_invalid_records():
+    """Test validation of JSON Lines records."""
+    record = module_to_dict(ModuleInfo("m", [Port("a", "input")], []))
+    assert module_from_dict(record) == ModuleInfo("m", [Port("a", "input")], [])
+    with pytest.raises(RuntimeError, match="Unsupported model version"):
+        module_from_dict(dict(record, version=99))
+    with pytest.raises(RuntimeError, match="Invalid direction"):
+        module_from_dict(dict(record, ports=[{"name": "a", "direction": "sideways"}]))
+    with pytest.raises(RuntimeError, match="Malformed"):
+        module_from_dict({"format": record["format"], "version": record["version"]})
+    for width in (0, -3, 1 << 32):
+        with pytest.raises(RuntimeError, match="Malformed module record: invalid width"):
+            module_from_dict(dict(record, ports=[{"name": "a", "direction": "input", "width": width}]))
+
+
+def test_invalid_binary_ports():
+    """Test that out-of-range ports are rejected when encoding and decoding."""
+    with pytest.raises(RuntimeError, match="Malformed module record: cannot encode port a"):
+        module_to_bytes(ModuleInfo("m", [Port("a", "input", width=-3)], []))
+    payload = bytearray(module_to_bytes(ModuleInfo("m", [Port("a", "input", width=4)], [])))
+    # Port record after the name and count: name, direction code, width
+    offset = 2 + 1 + 4 + 2 + 1
+    payload[offset] = 7
+    with pytest.raises(RuntimeError, match="invalid direction code 7"):
+        module_from_bytes(bytes(payload))
+    payload[offset:offset + 5] = b"\x00\x00\x00\x00\x00"
+    with pytest.raises(RuntimeError, match="invalid width 0"):
+        module_from_bytes(bytes(payload))
+
+
+def test_truncated_binary(modules, tmp_path):
+    """Test that a truncated binary file is reported."""
+    path = tmp_path / "model.bin"
+    write_modules(modules, str(path), binary=True)
+    path.write_bytes(path.read_bytes()[:-3])
+    with pytest.raises(RuntimeError, match="Truncated"):
+        list(read_modules(str(path)))
+
+
+def test_read_version_1(tmp_path):
+    """Test that version 1 files, without parameter expressions, are still read."""
+    module = ModuleInfo("m", [Port("a", "input", width=4)], [Parameter("WIDTH", 4)])
+    record = dict(module_to_dict(module), version=1)
+    assert module_from_dict(record) == module
+    path = tmp_path / "v1.bin"
+    payload = module_to_bytes(module)[:-2]  # drop the absent expression marker
+    path.write_bytes(BINARY_MAGIC + (1).to_bytes(2, "little")
+                     + len(payload).to_bytes(4, "little") + payload)
+    assert list(read_modules(str(path))) == [module]
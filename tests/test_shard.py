@@ -0,0 +1,79 @@
+"""Tests for deterministic shard partitioning and manifest merging."""
+import pytest
+
+from uvm_gen.shard import (
+    ShardSpec,
+    build_manifest,
+    merge_manifests,
+    parse_shard_spec,
+    partition,
+    report_ok,
+    select_shard,
+)
+
+
+def _entry(path, name):
+    return {"input": path, "module": name, "files": [], "seconds": 0.5}
+
+
+def test_parse_shard_spec():
+    """Test parsing of INDEX/COUNT specifications."""
+    assert parse_shard_spec("1/4") == ShardSpec(index=1, count=4)
+    for bad in ["4/4", "1", "a/b", "0/0", "-1/2"]:
+        with pytest.raises(ValueError):
+            parse_shard_spec(bad)
+
+
+def test_partition_covers_every_key_once():
+    """Test that shards are disjoint, complete and independent of input order."""
+    keys = [f"rtl/block_{i}.sv" for i in range(100)]
+    buckets = partition(keys, 4)
+    assert sorted(k for b in buckets for k in b) == sorted(keys)
+    assert partition(list(reversed(keys)), 4) == buckets
+    selected = [select_shard(keys, ShardSpec(i, 4)) for i in range(4)]
+    assert [sorted(s) for s in selected] == [sorted(b) for b in buckets]
+
+
+def test_partition_weighted_balances_load():
+    """Test that weighted partitioning evens out the total weight per shard."""
+    weights = {f"m{i}.sv": w for i, w in enumerate([100, 90, 50, 40, 30, 20, 10, 10])}
+    buckets = partition(list(weights), 2, weights)
+    loads = [sum(weights[k] for k in b) for b in buckets]
+    assert abs(loads[0] - loads[1]) <= 10
+    assert partition(list(weights), 2, weights) == buckets
+
+
+def test_merge_detects_missing_and_duplicates():
+    """Test that merging reports missing inputs, duplicates and missing shards."""
+    inputs = ["a.sv", "b.sv", "c.sv"]
+    shard0 = build_manifest(ShardSpec(0, 3), inputs, ["a.sv"], [_entry("a.sv", "a")])
+    shard1 = build_manifest(ShardSpec(1, 3), inputs, ["b.sv"],
+                            [_entry("b.sv", "b"), _entry("b.sv", "a")])
+    report = merge_manifests([shard0, shard1])
+    assert report["missing"] == ["c.sv"]
+    assert report["duplicates"] == {"a": ["0/3", "1/3"]}
+    assert report["missing_shards"] == [2]
+    assert report["total_seconds"] == pytest.approx(1.5)
+    assert not report_ok(report)
+
+
+def test_merge_complete_batch():
+    """Test that a complete batch merges cleanly."""
+    inputs = ["a.sv", "b.sv"]
+    manifests = [
+        build_manifest(ShardSpec(0, 2), inputs, ["a.sv"], [_entry("a.sv", "a")]),
+        build_manifest(ShardSpec(1, 2), inputs, ["b.sv"], [_entry("b.sv", "b")]),
+    ]
+    assert report_ok(merge_manifests(manifests))
+
+
+def test_merge_reports_shard_count_mismatch():
+    """Test that manifests from differently sized splits are reported, not raised."""
+    inputs = ["a.sv", "b.sv"]
+    manifests = [
+        build_manifest(ShardSpec(0, 2), inputs, ["a.sv"], [_entry("a.sv", "a")]),
+        build_manifest(ShardSpec(1, 3), inputs, ["b.sv"], [_entry("b.sv", "b")]),
+    ]
+    report = merge_manifests(manifests)
+    assert report["shard_counts"] == [2, 3]
+    assert not report_ok(report)
@@ -0,0 +1,96 @@
+"""Tests for offline stimulus generation."""
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from uvm_gen.model import ModuleInfo, Port
+from uvm_gen.stimulus import (
+    generate_vectors,
+    read_stimulus,
+    record_bytes,
+    restrict_constraints,
+    write_stimulus,
+)
+
+
+@pytest.fixture
+def module_info():
+    """Create a module mixing narrow and wide inputs."""
+    ports = [
+        Port(name="clk", direction="input"),
+        Port(name="op", direction="input", width=3),
+        Port(name="data", direction="input", width=70),
+        Port(name="mask", direction="input", width=5),
+        Port(name="result", direction="output", width=8),
+    ]
+    return ModuleInfo(name="alu", ports=ports, params=[])
+
+
+def test_record_layout(module_info):
+    """Test that records cover the driven inputs and skip the clock and outputs."""
+    assert record_bytes(module_info) == 10
+    assert generate_vectors(module_info, 7).shape == (7, 10)
+
+
+def test_round_trip_with_constraints(module_info, tmp_path):
+    """Test that values respect widths and constraints after a file round trip."""
+    path = str(tmp_path / "stim.bin")
+    constraints = {"op": {"values": [1, 6]}, "mask": {"min": 3, "max": 9}}
+    write_stimulus(path, module_info, 1000, constraints=constraints, seed=5, chunk_size=300)
+    vectors = read_stimulus(path, module_info)
+    assert len(vectors) == 1000
+    assert {v["op"] for v in vectors} == {1, 6}
+    assert all(3 <= v["mask"] <= 9 for v in vectors)
+    assert all(0 <= v["data"] < (1 << 70) for v in vectors)
+    assert max(v["data"] for v in vectors) >= (1 << 64)
+
+
+def test_patterns(module_info, tmp_path):
+    """Test deterministic patterns, including across chunk boundaries."""
+    path = str(tmp_path / "stim.bin")
+    write_stimulus(path, module_info, 80, pattern="increment",
+                   constraints={"data": {"pattern": "walking_ones"}, "mask": {"pattern": "ones"}},
+                   chunk_size=16)
+    vectors = read_stimulus(path, module_info)
+    assert [v["op"] for v in vectors[:10]] == [0, 1, 2, 3, 4, 5, 6, 7, 0, 1]
+    assert [v["data"] for v in vectors[:72]] == [1 << (i % 70) for i in range(72)]
+    assert {v["mask"] for v in vectors} == {31}
+
+
+def test_seed_is_reproducible(module_info):
+    """Test that the same seed gives the same vectors."""
+    first = generate_vectors(module_info, 50, seed=11)
+    assert np.array_equal(first, generate_vectors(module_info, 50, seed=11))
+    assert not np.array_equal(first, generate_vectors(module_info, 50, seed=12))
+
+
+def test_invalid_constraints(module_info):
+    """Test constraint validation."""
+    with pytest.raises(RuntimeError, match="unknown or undriven port"):
+        generate_vectors(module_info, 1, constraints={"result": {"min": 0}})
+    with pytest.raises(RuntimeError, match="does not fit"):
+        generate_vectors(module_info, 1, constraints={"op": {"values": [8]}})
+    with pytest.raises(RuntimeError, match="only supported up to 64 bits"):
+        generate_vectors(module_info, 1, constraints={"data": {"max": 5}})
+    with pytest.raises(RuntimeError, match="Unknown pattern"):
+        generate_vectors(module_info, 1, pattern="gray")
+    with pytest.raises(RuntimeError, match="only apply to the random pattern"):
+        generate_vectors(module_info, 1, constraints={"op": {"pattern": "increment", "max": 3}})
+    with pytest.raises(RuntimeError, match="only apply to the random pattern"):
+        generate_vectors(module_info, 1, pattern="ones", constraints={"op": {"values": [1]}})
+
+
+def test_restrict_constraints(module_info):
+    """Test that constraints are narrowed to a module's driven inputs."""
+    constraints = {"op": {"max": 3}, "result": {"min": 1}, "other": {"min": 0}}
+    assert restrict_constraints(constraints, module_info) == {"op": {"max": 3}}
+
+
+def test_invalid_request_writes_nothing(module_info, tmp_path):
+    """Test that a rejected request leaves no partial stimulus file behind."""
+    path = tmp_path / "stim.bin"
+    with pytest.raises(RuntimeError, match="unknown or undriven port"):
+        write_stimulus(str(path), module_info, 100, constraints={"nope": {"min": 1}})
+    with pytest.raises(RuntimeError, match="Unknown pattern"):
+        write_stimulus(str(path), module_info, 100, pattern="gray")
+    assert list(tmp_path.iterdir()) == []
@@ -0,0 +1,108 @@
+"""Tests for parameter sweep generation."""
+import json
+from pathlib import Path
+
+import pytest
+
+from uvm_gen.generator import TEMPLATES
+from uvm_gen.model import ModuleInfo, Parameter, Port
+from uvm_gen.sweep import (
+    expand_grid,
+    generate_sweep,
+    load_param_grid,
+    parse_param_option,
+    restrict_grid,
+    specialize,
+    variant_name,
+)
+
+
+@pytest.fixture
+def module_info():
+    """Create a parameterized module for sweeping."""
+    ports = [
+        Port(name="clk", direction="input"),
+        Port(name="data_in", direction="input", width=2, width_expr="WIDTH-1:0"),
+        Port(name="addr", direction="input", width=1, width_expr="$clog2(DEPTH)-1:0"),
+        Port(name="data_out", direction="output", width=8, width_expr="7:0"),
+    ]
+    params = [Parameter(name="WIDTH", default=8), Parameter(name="DEPTH", default=16)]
+    return ModuleInfo(name="fifo", ports=ports, params=params)
+
+
+def test_parse_param_option():
+    """Test parsing NAME=V1,V2 options."""
+    assert parse_param_option("WIDTH=8, 16,0x20") == {"WIDTH": [8, 16, 32]}
+    for bad in ["WIDTH", "WIDTH=", "=8", "WIDTH=a"]:
+        with pytest.raises(ValueError):
+            parse_param_option(bad)
+
+
+def test_load_param_grid(tmp_path):
+    """Test loading JSON and YAML grids."""
+    json_grid = tmp_path / "grid.json"
+    json_grid.write_text(json.dumps({"WIDTH": [8, 16], "DEPTH": 4}))
+    assert load_param_grid(str(json_grid)) == {"WIDTH": [8, 16], "DEPTH": [4]}
+
+    pytest.importorskip("yaml")
+    yaml_grid = tmp_path / "grid.yaml"
+    yaml_grid.write_text("WIDTH: [8, 16]\nDEPTH: 4\n")
+    assert load_param_grid(str(yaml_grid)) == {"WIDTH": [8, 16], "DEPTH": [4]}
+
+
+def test_expand_grid():
+    """Test that grid expansion yields every combination in order."""
+    combos = expand_grid({"WIDTH": [8, 16], "DEPTH": [4, 8]})
+    assert combos == [
+        {"WIDTH": 8, "DEPTH": 4},
+        {"WIDTH": 8, "DEPTH": 8},
+        {"WIDTH": 16, "DEPTH": 4},
+        {"WIDTH": 16, "DEPTH": 8},
+    ]
+    assert variant_name(combos[1]) == "WIDTH_8__DEPTH_8"
+
+
+def test_specialize_reevaluates_widths(module_info):
+    """Test that port widths follow the overridden parameters."""
+    variant = specialize(module_info, {"WIDTH": 32})
+    widths = {p.name: p.width for p in variant.ports}
+    assert widths == {"clk": 1, "data_in": 32, "addr": 4, "data_out": 8}
+    assert {p.name: p.default for p in variant.params} == {"WIDTH": 32, "DEPTH": 16}
+    # The original module is left untouched
+    assert module_info.ports[1].width == 2
+
+    with pytest.raises(RuntimeError, match="Unknown parameter"):
+        specialize(module_info, {"NOPE": 1})
+
+
+def test_specialize_derived_parameters():
+    """Test that parameters derived from an override follow it."""
+    module_info = ModuleInfo(
+        name="fifo",
+        ports=[Port(name="addr", direction="input", width=3, width_expr="AW-1:0")],
+        params=[Parameter(name="WIDTH", default=8),
+                Parameter(name="AW", default=3, expr="$clog2(WIDTH)"),
+                Parameter(name="MODE", default='"fast"', expr='"fast"')],
+    )
+    variant = specialize(module_info, {"WIDTH": 64})
+    assert [p.default for p in variant.params] == [64, 6, '"fast"']
+    assert variant.ports[0].width == 6
+    # An explicit override of a derived parameter wins
+    assert specialize(module_info, {"WIDTH": 64, "AW": 2}).ports[0].width == 2
+
+
+def test_restrict_grid(module_info):
+    """Test that a grid is narrowed to the parameters a module declares."""
+    grid = {"WIDTH": [8], "STATES": [2, 4], "DEPTH": [16]}
+    assert restrict_grid(grid, module_info) == {"WIDTH": [8], "DEPTH": [16]}
+
+
+def test_generate_sweep(module_info, tmp_path):
+    """Test that each combination is rendered into its own directory."""
+    results = generate_sweep(module_info, {"WIDTH": [4, 12], "DEPTH": [2]}, str(tmp_path), jobs=2)
+    assert sorted(Path(d).name for d in results) == ["WIDTH_12__DEPTH_2", "WIDTH_4__DEPTH_2"]
+    for files in results.values():
+        assert len(files) == len(TEMPLATES)
+    interface = (tmp_path / "WIDTH_12__DEPTH_2" / "fifo_interface.sv").read_text()
+    assert "logic [11:0] data_in;" in interface
+    assert "logic [0:0] addr;" in interface
@@ -0,0 +1,144 @@
+"""Asyncio API for embedding generation in event-loop based applications.
+
+Parsing, template rendering and file writes all run in an executor, so the
+event loop is never blocked. Results are identical to the synchronous API.
+"""
+
+import asyncio
+import functools
+from concurrent.futures import Executor
+from pathlib import Path
+from typing import List, Optional
+
+from uvm_gen.generator import UVMGenerator
+from uvm_gen.model import ModuleInfo
+from uvm_gen.parser import parse_rtl
+
+
+def _write_file(path: Path, content: str):
+    with open(path, "w") as f:
+        f.write(content)
+
+
+async def async_parse_rtl(filepath: str, executor: Optional[Executor] = None) -> ModuleInfo:
+    """Parse an RTL file without blocking the event loop.
+
+    Args:
+        filepath: Path to a .v or .sv file.
+        executor: Executor to run in, defaults to the loop's default executor.
+
+    Raises:
+        RuntimeError: If the file cannot be parsed, as for :func:`parse_rtl`.
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(executor, parse_rtl, filepath)
+
+
+class AsyncUVMGenerator:
+    """Asynchronous counterpart of :class:`UVMGenerator`.
+
+    The components of a testbench are rendered and written as independent
+    tasks. A semaphore shared by every call on the instance within an event
+    loop caps how many components are in flight at once, so several modules
+    can be generated concurrently without flooding the executor. The
+    instance can be reused across event loops.
+
+    Attributes:
+        generator: Synchronous generator holding the compiled templates.
+        max_concurrency: Maximum number of components in flight per event loop.
+        executor: Executor used for rendering and file I/O, or None for the
+            loop's default executor.
+    """
+
+    def __init__(self, template_dir: str, output_dir: str, max_concurrency: int = 4,
+                 executor: Optional[Executor] = None, **options):
+        """Initialize the asynchronous generator.
+
+        Args:
+            template_dir: Directory containing the Jinja2 templates.
+            output_dir: Directory where generated files will be saved.
+            max_concurrency: Maximum number of components rendered or written at once.
+            executor: Executor to run blocking work in.
+            **options: Generation options passed to :class:`UVMGenerator`.
+        """
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1")
+        self.generator = UVMGenerator(template_dir, output_dir, **options)
+        self.executor = executor
+        self.max_concurrency = max_concurrency
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._semaphore_loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        # A semaphore belongs to the loop it is first used in, so each new
+        # loop, e.g. from a later asyncio.run(), gets its own
+        loop = asyncio.get_running_loop()
+        if self._semaphore_loop is not loop:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+            self._semaphore_loop = loop
+        return self._semaphore
+
+    async def _run(self, func, *args, **kwargs):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, functools.partial(func, *args, **kwargs))
+
+    async def generate_component(self, template_name: str, module_info: ModuleInfo,
+                                 output_dir: Optional[str] = None, **context) -> str:
+        """Render a single template for a module and write it out.
+
+        Raises:
+            RuntimeError: If template rendering or file writing fails.
+        """
+        async with self._get_semaphore():
+            try:
+                content = await self._run(
+                    self.generator.render_component, template_name, module_info, **context
+                )
+                output_file = self.generator.component_path(template_name, module_info, output_dir)
+                await self._run(_write_file, output_file, content)
+            except Exception as e:
+                raise RuntimeError(f"Failed to generate {template_name}: {str(e)}")
+        return str(output_file)
+
+    async def generate_testbench(self, module_info: ModuleInfo,
+                                 output_dir: Optional[str] = None) -> List[str]:
+        """Generate UVM testbench components for a module.
+
+        Every component is attempted even if another one fails, and all
+        failures are reported together, as in the synchronous generator.
+        Cancelling the call cancels every component still pending; files
+        already written are left in place.
+
+        Args:
+            module_info: Information about the RTL module.
+            output_dir: Directory to write into instead of the generator's.
+
+        Returns:
+            List of paths to generated files, in the same order as
+            :meth:`UVMGenerator.generate_testbench`.
+
+        Raises:
+            RuntimeError: If the options do not suit the module, or if
+                template rendering or file writing fails for any component;
+                the message lists every failed template.
+        """
+        self.generator.check_module(module_info)
+        output_dir = Path(output_dir) if output_dir is not None else self.generator.output_dir
+        await self._run(output_dir.mkdir, parents=True, exist_ok=True)
+
+        tasks = [
+            asyncio.ensure_future(self.generate_component(template_name, module_info, output_dir))
+            for template_name in self.generator.templates
+        ]
+        try:
+            results = await asyncio.gather(*tasks, return_exceptions=True)
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            raise
+
+        errors = [str(r) for r in results if isinstance(r, BaseException)]
+        if errors:
+            raise RuntimeError("\n".join(errors))
+        return list(results)
@@ -1,27 +1,340 @@
 """Command-line interface for UVM testbench generator."""
 
 import click
+import json
+import time
 from pathlib import Path
 
-from uvm_gen.generator import UVMGenerator
+from uvm_gen.generator import UVMGenerator, check_valid_condition
+from uvm_gen.hierarchy import build_graph, generate_hierarchy
 from uvm_gen.parser import parse_rtl
 from uvm_gen.codegen import CodeGenerator
+from uvm_gen.serialize import ModuleWriter, read_modules, write_modules
+from uvm_gen.shard import (
+    build_manifest,
+    file_size_weights,
+    load_manifest,
+    merge_manifests,
+    parse_shard_spec,
+    partition,
+    report_ok,
+    select_shard,
+    shard_owns,
+    write_manifest,
+)
+from uvm_gen.stimulus import (
+    PATTERNS,
+    record_bytes,
+    restrict_constraints,
+    validate_constraints,
+    write_stimulus,
+)
+from uvm_gen.sweep import (
+    expand_grid,
+    generate_sweep,
+    load_param_grid,
+    merge_grids,
+    parse_param_option,
+    restrict_grid,
+    specialize,
+    variant_name,
+)
+from uvm_gen.utils import ensure_dir
+
+
+def _shard_option(ctx, param, value):
+    if value is None:
+        return None
+    try:
+        return parse_shard_spec(value)
+    except ValueError as e:
+        raise click.BadParameter(str(e))
+
+
+def _param_option(ctx, param, value):
+    try:
+        return merge_grids(parse_param_option(v) for v in value)
+    except ValueError as e:
+        raise click.BadParameter(str(e))
+
+
+def _iter_models(paths, shard, shard_by_size, names):
+    """Yield ``(input, module)`` for each stored module owned by the shard.
+
+    Modules are streamed from the model files; every module name seen is
+    appended to ``names`` for the manifest. Balancing by size needs one
+    extra pass over the files to collect the port count of each module.
+    """
+    owned = None
+    if shard is not None and shard_by_size:
+        weights = {m.name: len(m.ports) for path in paths for m in read_modules(path)}
+        owned = set(partition(list(weights), shard.count, weights)[shard.index])
+    for path in paths:
+        for module in read_modules(path):
+            names.append(module.name)
+            if shard is None or (module.name in owned if owned is not None
+                                 else shard_owns(shard, module.name)):
+                yield module.name, module
+
+
+def _merge(manifest_paths, out):
+    try:
+        manifests = [load_manifest(p) for p in manifest_paths]
+    except RuntimeError as e:
+        raise click.ClickException(str(e))
+    report = merge_manifests(manifests)
+    ensure_dir(out)
+    report_path = Path(out) / "merged_manifest.json"
+    write_manifest(report, str(report_path))
+    click.echo(f"Merged {len(manifest_paths)} manifests ({len(report['modules'])} modules) "
+               f"into {report_path}")
+    if not report_ok(report):
+        problems = []
+        if report["missing"]:
+            problems.append(f"missing inputs: {', '.join(report['missing'])}")
+        if report["duplicates"]:
+            problems.append(f"duplicated modules: {', '.join(report['duplicates'])}")
+        if report["missing_shards"]:
+            problems.append(f"missing shards: {', '.join(map(str, report['missing_shards']))}")
+        if report["repeated_shards"]:
+            problems.append(f"repeated shards: {', '.join(map(str, report['repeated_shards']))}")
+        if report["inconsistent_inputs"]:
+            problems.append("shards were run on different input lists")
+        if report["shard_counts"]:
+            problems.append(f"shards disagree on the shard count: {', '.join(map(str, report['shard_counts']))}")
+        raise click.ClickException("; ".join(problems))
 
 
 @click.command(help="Generate UVM TB skeleton from Verilog-2001 RTL.")
-@click.option('-r','--rtl',   required=True, type=click.Path(), help='RTL file (.sv)')
+@click.option('-r','--rtl',   multiple=True, type=click.Path(), help='RTL file (.sv), may be repeated')
 @click.option('-o','--out',   required=True, type=click.Path(), help='Output directory')
+@click.option('--shard', callback=_shard_option, metavar='INDEX/COUNT',
+              help='Only generate the inputs owned by this shard')
+@click.option('--shard-by-size', is_flag=True,
+              help='Balance shards by RTL file size, or by port count with --from-model')
+@click.option('--manifest', type=click.Path(), help='Write a manifest of generated outputs and timings')
+@click.option('--merge', multiple=True, type=click.Path(exists=True),
+              help='Merge shard manifests into OUT/merged_manifest.json instead of generating')
+@click.option('--dump-model', type=click.Path(),
+              help='Also write the parsed modules to this file (JSON Lines, or binary if it ends in .bin)')
+@click.option('--from-model', multiple=True, type=click.Path(exists=True),
+              help='Read modules from a model file instead of parsing RTL, may be repeated')
+@click.option('-p','--param', multiple=True, callback=_param_option, metavar='NAME=V1,V2',
+              help='Sweep a parameter over the given values, may be repeated')
+@click.option('--param-grid', type=click.Path(exists=True),
+              help='JSON or YAML file mapping parameter names to values to sweep')
+@click.option('--hierarchy', is_flag=True,
+              help='Elaborate instantiations across all RTL files and generate top-level envs')
+@click.option('--top', multiple=True, help='Top module for --hierarchy, defaults to every uninstantiated module')
+@click.option('--valid-cond', help='Condition over port names for the monitor to publish, e.g. "valid && ready"')
+@click.option('--input-skew', default='1step', show_default=True, help='Clocking block input skew')
+@click.option('--output-skew', default='1', show_default=True, help='Clocking block output skew')
+@click.option('--stimulus', type=click.IntRange(min=1), metavar='COUNT',
+              help='Write COUNT input vectors to OUT/<module>_stim.bin and generate a file-driven sequence')
+@click.option('--stim-pattern', type=click.Choice(PATTERNS), default='random', show_default=True,
+              help='Default stimulus pattern for every input')
+@click.option('--stim-constraints', type=click.Path(exists=True),
+              help='JSON file mapping input names to {"min", "max", "values", "pattern"} constraints')
+@click.option('--stim-seed', type=int, help='Random seed for stimulus generation')
+@click.option('-j','--jobs', type=click.IntRange(min=1), help='Maximum parallel workers (variants, blocks or components)')
 @click.option('-v','--verbose', is_flag=True, help='Enable verbose logging')
-def main(rtl, out, verbose):
-    if not rtl.endswith(('.sv','.v')):
-        raise click.UsageError("Invalid extension: must be .sv or .v")
-    if verbose:
-        click.echo(f"Parsing RTL: {rtl}")
-    module = parse_rtl(rtl)
-    gen = CodeGenerator()
-    gen.render(module, out)
+def main(rtl, out, shard, shard_by_size, manifest, merge, dump_model, from_model, param, param_grid,
+         hierarchy, top, valid_cond, input_skew, output_skew, stimulus, stim_pattern,
+         stim_constraints, stim_seed, jobs, verbose):
+    if merge:
+        _merge(merge, out)
+        return
+    if rtl and from_model:
+        raise click.UsageError("--rtl and --from-model are mutually exclusive")
+    if not rtl and not from_model:
+        raise click.UsageError("Missing option '-r' / '--rtl'.")
+    for path in rtl:
+        if not path.endswith(('.sv','.v')):
+            raise click.UsageError("Invalid extension: must be .sv or .v")
+
+    assigned = list(rtl)
+    if shard is not None:
+        if rtl:
+            weights = file_size_weights(rtl) if shard_by_size else None
+            assigned = select_shard(rtl, shard, weights)
+            if verbose:
+                click.echo(f"Shard {shard}: {len(assigned)} of {len(rtl)} RTL files")
+        if manifest is None:
+            manifest = str(Path(out) / f"manifest-shard-{shard.index}-of-{shard.count}.json")
+
+    grid = {}
+    if param_grid:
+        grid.update(load_param_grid(param_grid))
+    grid.update(param)
+    options = dict(valid_condition=valid_cond, input_skew=input_skew, output_skew=output_skew,
+                   file_stimulus=stimulus is not None)
+    if hierarchy and (shard is not None or grid or from_model or stimulus):
+        raise click.UsageError(
+            "--hierarchy cannot be combined with --shard, --from-model, --stimulus or parameter sweeps"
+        )
+    if top and not hierarchy:
+        raise click.UsageError("--top requires --hierarchy")
+    if valid_cond is not None:
+        try:
+            check_valid_condition(valid_cond)
+        except RuntimeError as e:
+            raise click.BadParameter(str(e), param_hint="'--valid-cond'")
+
+    def check_condition(module):
+        """Check --valid-cond against a module before any of its files are rendered."""
+        if valid_cond is not None:
+            try:
+                check_valid_condition(valid_cond, module)
+            except RuntimeError as e:
+                raise click.BadParameter(str(e), param_hint="'--valid-cond'")
+    constraints = {}
+    if stim_constraints:
+        try:
+            with open(stim_constraints) as f:
+                constraints = json.load(f)
+        except ValueError as e:
+            raise click.BadParameter(f"invalid JSON: {e}", param_hint="'--stim-constraints'")
+        if not isinstance(constraints, dict):
+            raise click.BadParameter("expected a mapping of input names to constraints",
+                                     param_hint="'--stim-constraints'")
+
+    if hierarchy:
+        graph = build_graph(rtl)
+        tops = list(top) or graph.tops()
+        if verbose:
+            click.echo(f"Elaborated {len(graph.modules)} modules, tops: {', '.join(tops)}")
+        if dump_model:
+            ensure_dir(str(Path(dump_model).parent))
+            count = write_modules(graph.modules.values(), dump_model, binary=dump_model.endswith('.bin'))
+            if verbose:
+                click.echo(f"Wrote {count} modules to {dump_model}")
+        for name in graph.subtrees(tops):
+            check_condition(graph.modules[name])
+        timings = {}
+        generated = generate_hierarchy(graph, tops, out, jobs=jobs, timings=timings, **options)
+        # One entry per generated module, keyed by the file that defines it
+        entries = [{
+            "input": graph.sources[name],
+            "module": name,
+            "files": files,
+            "seconds": timings[name],
+        } for name, files in generated.items()]
+        if manifest is not None:
+            ensure_dir(str(Path(manifest).parent))
+            assigned = list(dict.fromkeys(entry["input"] for entry in entries))
+            write_manifest(build_manifest(None, rtl, assigned, entries), manifest)
+        click.echo(f"UVM skeleton generated in {out}")
+        return
+
+    def parse_assigned():
+        for path in assigned:
+            if verbose:
+                click.echo(f"Parsing RTL: {path}")
+            yield path, parse_rtl(path)
+
+    inputs = list(rtl)
+    if from_model:
+        # Filled in as the model files are streamed
+        inputs = []
+        items = _iter_models(from_model, shard, shard_by_size, inputs)
+    else:
+        items = parse_assigned()
+
+    writer = None
+    if dump_model:
+        ensure_dir(str(Path(dump_model).parent))
+        writer = ModuleWriter(dump_model, binary=dump_model.endswith('.bin'))
+
+    def check_stimulus(module):
+        """Check a module can be stimulated before any of its files are rendered."""
+        if record_bytes(module) == 0:
+            raise click.UsageError(f"--stimulus: module {module.name} has no inputs to drive")
+        try:
+            validate_constraints(module, restrict_constraints(constraints, module), stim_pattern)
+        except RuntimeError as e:
+            raise click.UsageError(f"--stim-constraints: {e} (module {module.name})")
+
+    def write_vectors(module, directory):
+        ensure_dir(str(directory))
+        path = Path(directory) / f"{module.name}_stim.bin"
+        # Constraints on inputs of other modules in the batch are dropped
+        write_stimulus(str(path), module, stimulus, stim_pattern,
+                       restrict_constraints(constraints, module), stim_seed)
+        if verbose:
+            click.echo(f"Wrote {stimulus} vectors to {path}")
+        return str(path)
+
+    gen = CodeGenerator(**options)
+    entries = []
+    swept = {}
+    constrained = {}
+    try:
+        # Parsing happens lazily inside the iterator, so each module is
+        # timed from the end of the previous one to include it
+        start = time.perf_counter()
+        for key, module in items:
+            if writer is not None:
+                writer.write(module)
+            check_condition(module)
+            # Each module is swept over the parameters it declares; the
+            # others in the grid are meant for other modules of the batch
+            module_grid = restrict_grid(grid, module)
+            swept.update(module_grid)
+            # Variants are checked before anything is rendered
+            specialized = [module]
+            if module_grid:
+                try:
+                    specialized = [specialize(module, combo) for combo in expand_grid(module_grid)]
+                except RuntimeError as e:
+                    raise click.UsageError(f"Cannot sweep module {module.name}: {e}")
+            if stimulus:
+                # No file sequence is written for a module, or a variant,
+                # whose vectors cannot be generated
+                for variant in specialized:
+                    check_stimulus(variant)
+                constrained.update(restrict_constraints(constraints, module))
+            if module_grid:
+                variants = generate_sweep(module, module_grid, out, jobs=jobs, **options)
+                files = [f for variant_files in variants.values() for f in variant_files]
+                if verbose:
+                    click.echo(f"Generated {len(variants)} variants of {module.name}")
+                if stimulus:
+                    # Each variant has its own port widths, hence its own vectors
+                    files += [write_vectors(variant, Path(out) / variant_name(combo))
+                              for combo, variant in zip(expand_grid(module_grid), specialized)]
+            else:
+                files = gen.render(module, out, jobs=jobs or 1)
+                if stimulus:
+                    files.append(write_vectors(module, out))
+            entries.append({
+                "input": key,
+                "module": module.name,
+                "files": files,
+                "seconds": time.perf_counter() - start,
+            })
+            start = time.perf_counter()
+    finally:
+        gen.close()
+        if writer is not None:
+            writer.close()
+    unused = [name for name in grid if name not in swept]
+    if unused:
+        click.echo(f"Warning: no module declares parameter(s) {', '.join(unused)}", err=True)
+    unused = [name for name in constraints if name not in constrained]
+    if unused:
+        click.echo(f"Warning: no module drives constrained input(s) {', '.join(unused)}", err=True)
+    if writer is not None and verbose:
+        click.echo(f"Wrote {writer.count} modules to {dump_model}")
+    if from_model:
+        assigned = [entry["input"] for entry in entries]
+
+    if manifest is not None:
+        ensure_dir(str(Path(manifest).parent))
+        write_manifest(build_manifest(shard, inputs, assigned, entries), manifest)
+        if verbose:
+            click.echo(f"Manifest written to {manifest}")
     click.echo(f"UVM skeleton generated in {out}")
 
 
 if __name__ == "__main__":
-    main() 
\ No newline at end of file
+    main()
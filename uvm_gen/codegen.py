@@ -4,12 +4,20 @@ from uvm_gen.generator import UVMGenerator
 from uvm_gen.utils import ensure_dir
 
 class CodeGenerator:
-    """Code generator for UVM testbench skeleton."""
-    def __init__(self, template_dir=None):
-        self.template_dir = template_dir
+    """Code generator for UVM testbench skeleton.
 
-    def render(self, module, out_dir):
+    One :class:`UVMGenerator` is shared by every module rendered, so the
+    templates are compiled, and any worker processes started, only once.
+    Call :meth:`close` when done.
+    """
+    def __init__(self, template_dir=None, **options):
+        self.template_dir = template_dir or str(Path(__file__).parent / "templates")
+        self.options = options
+        self.generator = UVMGenerator(self.template_dir, ".", **options)
+
+    def render(self, module, out_dir, jobs=1):
         ensure_dir(out_dir)
-        template_dir = self.template_dir or str(Path(__file__).parent / "templates")
-        gen = UVMGenerator(template_dir, out_dir)
-        return gen.generate_testbench(module) 
\ No newline at end of file
+        return self.generator.generate_testbench(module, output_dir=out_dir, jobs=jobs)
+
+    def close(self):
+        self.generator.close()
@@ -4,14 +4,117 @@ This module provides functionality to generate UVM testbench components
 from RTL module information using Jinja2 templates.
 """
 
-import os
+import pickle
+import re
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from pathlib import Path
-from typing import List, Optional
+from typing import Dict, List, Optional
 
 from jinja2 import Environment, FileSystemLoader, select_autoescape
 
 from uvm_gen.model import ModuleInfo
 
+# Templates rendered for every module, in generation order.
+TEMPLATES = [
+    "agent.sv.j2",
+    "driver.sv.j2",
+    "sequencer.sv.j2",
+    "scoreboard.sv.j2",
+    "env.sv.j2",
+    "tb_top.sv.j2",
+    "test.sv.j2",
+    "sequence.sv.j2",
+    "transaction.sv.j2",
+    "interface.sv.j2",
+    "config.sv.j2",
+    "pkg.sv.j2",
+    "monitor.sv.j2",
+]
+
+# Extra template rendered when file-driven stimulus is enabled
+FILE_SEQUENCE_TEMPLATE = "file_sequence.sv.j2"
+
+_process_environments: Dict[str, Environment] = {}
+
+
+# Identifier in a SystemVerilog expression that is not a member, system task or literal
+_IDENTIFIER = re.compile(r"(?<![\w.$'])([A-Za-z_]\w*)")
+
+
+def qualify_signals(expr: str, module_info: ModuleInfo, prefix: str) -> str:
+    """Prefix every port name in a SystemVerilog expression.
+
+    Used to turn a condition written in terms of port names, such as
+    ``valid && ready``, into one that reads them through the interface,
+    e.g. ``vif.mon_cb.valid && vif.mon_cb.ready``.
+    """
+    names = {port.name for port in module_info.ports}
+    return _IDENTIFIER.sub(lambda m: prefix + m.group(1) if m.group(1) in names else m.group(1),
+                           expr)
+
+
+def referenced_ports(expr: Optional[str], module_info: ModuleInfo) -> List[str]:
+    """Return the ports named in a SystemVerilog expression, in port order."""
+    if not expr:
+        return []
+    used = set(_IDENTIFIER.findall(expr))
+    return [port.name for port in module_info.ports if port.name in used]
+
+
+def check_valid_condition(expr: str, module_info: Optional[ModuleInfo] = None):
+    """Check a monitor valid condition before it is rendered.
+
+    The condition must name at least one signal and, when a module is given,
+    every name must be one of its ports other than the clock, since only
+    those can be read through the monitor clocking block.
+
+    Raises:
+        RuntimeError: If the condition names nothing or names anything else.
+    """
+    names = list(dict.fromkeys(_IDENTIFIER.findall(expr)))
+    if not names:
+        raise RuntimeError(f"Valid condition {expr!r} does not name any port")
+    if module_info is None:
+        return
+    if module_info.clock_port in names:
+        raise RuntimeError(f"Valid condition {expr!r} cannot use the clock port "
+                           f"{module_info.clock_port} of module {module_info.name}")
+    ports = {port.name for port in module_info.ports}
+    unknown = [name for name in names if name not in ports]
+    if unknown:
+        raise RuntimeError(f"Valid condition {expr!r} names unknown port(s) of module "
+                           f"{module_info.name}: {', '.join(unknown)}")
+
+
+def _make_environment(template_dir: str) -> Environment:
+    env = Environment(
+        loader=FileSystemLoader(template_dir),
+        autoescape=select_autoescape(),
+        trim_blocks=True,
+        lstrip_blocks=True,
+    )
+    env.filters["qualify_signals"] = qualify_signals
+    env.filters["referenced_ports"] = referenced_ports
+    return env
+
+
+def _render_in_process(template_dir: str, template_name: str, module_payload: bytes,
+                       context: dict) -> str:
+    """Render a template in a worker process, reusing its compiled templates.
+
+    The module arrives pre-pickled so the parent serializes it once per call
+    rather than once per template.
+    """
+    module_info = pickle.loads(module_payload)
+    env = _process_environments.get(template_dir)
+    if env is None:
+        env = _process_environments[template_dir] = _make_environment(template_dir)
+    try:
+        return env.get_template(template_name).render(module=module_info, **context)
+    except Exception as e:
+        # Jinja2 exceptions do not always survive pickling back to the parent
+        raise RuntimeError(str(e))
+
 
 class UVMGenerator:
     """UVM testbench generator class.
@@ -22,68 +125,199 @@ class UVMGenerator:
     Attributes:
         template_dir: Directory containing the Jinja2 templates.
         output_dir: Directory where generated files will be saved.
+        context: Generation options passed to every template.
+        templates: Templates rendered for every module, in generation order.
         env: Jinja2 environment for template rendering.
     """
 
-    def __init__(self, template_dir: str, output_dir: str):
+    def __init__(self, template_dir: str, output_dir: str,
+                 valid_condition: Optional[str] = None,
+                 input_skew: str = "1step", output_skew: str = "1",
+                 file_stimulus: bool = False):
         """Initialize the UVM generator.
 
         Args:
             template_dir: Directory containing the Jinja2 templates.
             output_dir: Directory where generated files will be saved.
+            valid_condition: SystemVerilog expression over port names that
+                must hold for the monitor to publish a transaction, e.g.
+                ``"valid && ready"``. Defaults to publishing every cycle.
+                Each module generated must have every port it names, and
+                none of them may be the clock.
+            input_skew: Input skew of the interface clocking blocks.
+            output_skew: Output skew of the interface clocking blocks.
+            file_stimulus: Also generate ``<name>_file_sequence.sv``, a
+                sequence streaming vectors from a file written by
+                :mod:`uvm_gen.stimulus`.
         """
+        if valid_condition is not None:
+            check_valid_condition(valid_condition)
         self.template_dir = Path(template_dir)
         self.output_dir = Path(output_dir)
-        self.env = Environment(
-            loader=FileSystemLoader(str(self.template_dir)),
-            autoescape=select_autoescape(),
-            trim_blocks=True,
-            lstrip_blocks=True,
-        )
-
-    def generate_testbench(self, module_info: ModuleInfo) -> List[str]:
+        self.context = {
+            "valid_condition": valid_condition,
+            "input_skew": input_skew,
+            "output_skew": output_skew,
+            "file_stimulus": file_stimulus,
+        }
+        self.templates = TEMPLATES + ([FILE_SEQUENCE_TEMPLATE] if file_stimulus else [])
+        self.env = _make_environment(str(self.template_dir))
+        self._process_pool: Optional[ProcessPoolExecutor] = None
+        self._process_pool_size = 0
+
+    def close(self):
+        """Shut down the worker processes used for concurrent rendering, if any."""
+        if self._process_pool is not None:
+            self._process_pool.shutdown()
+            self._process_pool = None
+            self._process_pool_size = 0
+
+    def _get_process_pool(self, jobs: int) -> ProcessPoolExecutor:
+        # Workers are kept between calls so each compiles the templates only once
+        jobs = min(jobs, len(self.templates))
+        if self._process_pool is None or self._process_pool_size != jobs:
+            self.close()
+            self._process_pool = ProcessPoolExecutor(max_workers=jobs)
+            self._process_pool_size = jobs
+        return self._process_pool
+
+    def generate_testbench(self, module_info: ModuleInfo,
+                           output_dir: Optional[str] = None, jobs: int = 1,
+                           use_processes: bool = False) -> List[str]:
         """Generate UVM testbench components for a module.
 
+        Every template is attempted even if an earlier one fails, and all
+        failures are reported together.
+
         Args:
             module_info: Information about the RTL module.
+            output_dir: Directory to write into instead of ``self.output_dir``.
+                The compiled templates are shared, so one generator can
+                render many modules into different directories.
+            jobs: Number of components rendered and written concurrently.
+                Output is identical to the sequential run.
+            use_processes: Render in worker processes instead of threads when
+                ``jobs`` is above 1. Pickling the module and compiling the
+                templates in each worker often costs more than it saves, so
+                this is opt-in; measure with ``benchmarks/bench_concurrent_render.py``.
 
         Returns:
-            List of paths to generated files.
+            List of paths to generated files, in template order.
 
         Raises:
-            RuntimeError: If template rendering or file writing fails.
+            RuntimeError: If the options do not suit the module, see
+                :meth:`check_module`, or if template rendering or file writing
+                fails for any component; the message lists every failed template.
         """
-        generated_files = []
-        templates = [
-            "agent.sv.j2",
-            "driver.sv.j2",
-            "sequencer.sv.j2",
-            "scoreboard.sv.j2",
-            "env.sv.j2",
-            "tb_top.sv.j2",
-            "test.sv.j2",
-            "sequence.sv.j2",
-            "transaction.sv.j2",
-            "interface.sv.j2",
-            "config.sv.j2",
-            "pkg.sv.j2",
-        ]
+        self.check_module(module_info)
+        output_dir = Path(output_dir) if output_dir is not None else self.output_dir
 
         # Create output directory if it doesn't exist
-        self.output_dir.mkdir(parents=True, exist_ok=True)
-
-        # Generate each component
-        for template_name in templates:
-            try:
-                template = self.env.get_template(template_name)
-                output_file = self.output_dir / f"{module_info.name}_{template_name[:-3]}"
-                content = template.render(module=module_info)
-                
-                with open(output_file, "w") as f:
-                    f.write(content)
-                
-                generated_files.append(str(output_file))
-            except Exception as e:
-                raise RuntimeError(f"Failed to generate {template_name}: {str(e)}")
-
-        return generated_files 
\ No newline at end of file
+        output_dir.mkdir(parents=True, exist_ok=True)
+
+        if jobs <= 1:
+            results = []
+            for template_name in self.templates:
+                try:
+                    results.append(self.generate_component(template_name, module_info, output_dir))
+                except RuntimeError as e:
+                    results.append(e)
+        else:
+            results = self._generate_concurrently(module_info, output_dir, jobs, use_processes)
+
+        errors = [str(r) for r in results if isinstance(r, Exception)]
+        if errors:
+            raise RuntimeError("\n".join(errors))
+        return results
+
+    def _generate_concurrently(self, module_info: ModuleInfo, output_dir: Path,
+                               jobs: int, use_processes: bool) -> list:
+        """Render and write all templates concurrently.
+
+        Returns one entry per template, in template order: the generated
+        path, or the RuntimeError describing why that template failed.
+        """
+        def render(template_name):
+            return self.render_component(template_name, module_info)
+
+        def write(template_name, content):
+            output_file = self.component_path(template_name, module_info, output_dir)
+            with open(output_file, "w") as f:
+                f.write(content)
+            return str(output_file)
+
+        with ThreadPoolExecutor(max_workers=jobs) as thread_pool:
+            if use_processes:
+                process_pool = self._get_process_pool(jobs)
+                payload = pickle.dumps(module_info, protocol=pickle.HIGHEST_PROTOCOL)
+                renders = [process_pool.submit(_render_in_process, str(self.template_dir),
+                                               name, payload, self.context)
+                           for name in self.templates]
+            else:
+                renders = [thread_pool.submit(render, name) for name in self.templates]
+
+            # Each write is queued as soon as its render is collected, in template order
+            writes = []
+            for template_name, future in zip(self.templates, renders):
+                try:
+                    writes.append(thread_pool.submit(write, template_name, future.result()))
+                except Exception as e:
+                    writes.append(e)
+
+            results = []
+            for template_name, write_future in zip(self.templates, writes):
+                try:
+                    if isinstance(write_future, Exception):
+                        raise write_future
+                    results.append(write_future.result())
+                except Exception as e:
+                    results.append(RuntimeError(f"Failed to generate {template_name}: {str(e)}"))
+        return results
+
+    def check_module(self, module_info: ModuleInfo):
+        """Check the generation options against a module before rendering it.
+
+        Raises:
+            RuntimeError: If the valid condition names anything but the
+                module's non-clock ports.
+        """
+        if self.context["valid_condition"] is not None:
+            check_valid_condition(self.context["valid_condition"], module_info)
+
+    def generate_component(self, template_name: str, module_info: ModuleInfo,
+                           output_dir: Optional[str] = None, **context) -> str:
+        """Render a single template for a module and write it out.
+
+        Args:
+            template_name: Name of the template, e.g. ``"agent.sv.j2"``.
+            module_info: Information about the RTL module.
+            output_dir: Directory to write into instead of ``self.output_dir``.
+            **context: Extra variables made available to the template.
+
+        Returns:
+            Path to the generated file.
+
+        Raises:
+            RuntimeError: If template rendering or file writing fails.
+        """
+        try:
+            content = self.render_component(template_name, module_info, **context)
+            output_file = self.component_path(template_name, module_info, output_dir)
+
+            with open(output_file, "w") as f:
+                f.write(content)
+
+            return str(output_file)
+        except Exception as e:
+            raise RuntimeError(f"Failed to generate {template_name}: {str(e)}")
+
+    def render_component(self, template_name: str, module_info: ModuleInfo, **context) -> str:
+        """Render a single template for a module without writing it."""
+        template = self.env.get_template(template_name)
+        return template.render(module=module_info, **{**self.context, **context})
+
+    def component_path(self, template_name: str, module_info: ModuleInfo,
+                       output_dir: Optional[str] = None) -> Path:
+        """Return the path a template is written to for a module."""
+        output_dir = Path(output_dir) if output_dir is not None else self.output_dir
+        return output_dir / f"{module_info.name}_{template_name[:-3]}"
@@ -0,0 +1,232 @@
+"""Hierarchy-aware elaboration of RTL designs.
+
+Module bodies are scanned for instantiations of other modules, building an
+instantiation graph across a set of files. The graph is then used to generate
+testbenches for every block below a top module, plus a top-level environment
+composing the agents of the sub-blocks.
+"""
+
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+
+from uvm_gen.generator import UVMGenerator
+from uvm_gen.model import Instance, ModuleInfo
+from uvm_gen.parser import parse_module_text
+
+# Templates rendered for every module that instantiates others
+TOP_TEMPLATES = ["top_env.sv.j2", "top_pkg.sv.j2"]
+
+_COMMENT = re.compile(r'//[^\n]*|/\*.*?\*/', re.S)
+_MODULE_BLOCK = re.compile(r'\bmodule\s+(\w+)(.*?)\bendmodule\b', re.S)
+# <type> [#(<overrides>)] <instance> [<array range>] (
+_INSTANCE = re.compile(
+    r'\b(\w+)\s*(?:#\s*\((?:[^()]|\([^()]*\))*\)\s*)?(\w+)\s*(?:\[[^\]]*\]\s*)?\('
+)
+# , <instance> [<array range>] (  -- further instances in the same statement
+_INSTANCE_CONTINUATION = re.compile(r'\s*,\s*(\w+)\s*(?:\[[^\]]*\]\s*)?\(')
+
+
+@dataclass
+class InstanceGraph:
+    """Instantiation graph of a set of modules, indexed by module name.
+
+    Attributes:
+        modules: Module information for every defined module.
+        sources: File each module was defined in.
+        instances: Instantiations found in the body of each module, in
+            source order.
+    """
+    modules: Dict[str, ModuleInfo] = field(default_factory=dict)
+    sources: Dict[str, str] = field(default_factory=dict)
+    instances: Dict[str, List[Instance]] = field(default_factory=dict)
+
+    def tops(self) -> List[str]:
+        """Return the modules that are not instantiated anywhere, in definition order."""
+        instantiated = {inst.module for insts in self.instances.values() for inst in insts}
+        return [name for name in self.modules if name not in instantiated]
+
+    def subtree(self, top: str) -> List[str]:
+        """Return every module reachable from ``top``, children before parents.
+
+        Raises:
+            RuntimeError: If ``top`` is unknown or the hierarchy is recursive.
+        """
+        if top not in self.modules:
+            raise RuntimeError(f"Module not found: {top}")
+        order: List[str] = []
+        state: Dict[str, bool] = {}  # False while visiting, True once done
+        stack = [(top, iter(self.instances.get(top, [])))]
+        state[top] = False
+        while stack:
+            name, children = stack[-1]
+            child = next(children, None)
+            if child is None:
+                stack.pop()
+                state[name] = True
+                order.append(name)
+            elif child.module not in state:
+                state[child.module] = False
+                stack.append((child.module, iter(self.instances.get(child.module, []))))
+            elif not state[child.module]:
+                raise RuntimeError(f"Recursive instantiation of {child.module} in {name}")
+        return order
+
+    def subtrees(self, tops: Iterable[str]) -> List[str]:
+        """Return every module reachable from any of ``tops``, each listed once.
+
+        Children still come before parents, as in :meth:`subtree`.
+        """
+        order: List[str] = []
+        seen = set()
+        for top in tops:
+            for name in self.subtree(top):
+                if name not in seen:
+                    seen.add(name)
+                    order.append(name)
+        return order
+
+
+def _closing_paren(text: str, pos: int) -> int:
+    """Return the index just past the ``)`` closing the ``(`` before ``pos``."""
+    depth = 1
+    while pos < len(text) and depth:
+        if text[pos] == '(':
+            depth += 1
+        elif text[pos] == ')':
+            depth -= 1
+        pos += 1
+    return pos
+
+
+def _scan_instances(body: str) -> Tuple[List[Instance], str]:
+    """Return the instantiation candidates of a module body, and the body without them.
+
+    Candidates are every ``<type> <instance> (...)`` statement, including
+    each instance of a ``<type> u0 (...), u1 (...);`` list; they are
+    resolved against the symbol table once all files are scanned. Their
+    connection lists are cut from the returned body so they are not mistaken
+    for port declarations.
+    """
+    candidates = []
+    kept = []
+    pos = 0
+    while True:
+        match = _INSTANCE.search(body, pos)
+        if not match:
+            break
+        candidates.append(Instance(module=match.group(1), name=match.group(2)))
+        kept.append(body[pos:match.start()])
+        pos = _closing_paren(body, match.end())
+        # leaf u0 (...), u1 (...);
+        more = _INSTANCE_CONTINUATION.match(body, pos)
+        while more:
+            candidates.append(Instance(module=match.group(1), name=more.group(1)))
+            pos = _closing_paren(body, more.end())
+            more = _INSTANCE_CONTINUATION.match(body, pos)
+    kept.append(body[pos:])
+    return candidates, ' '.join(kept)
+
+
+def _scan_file(filepath: str) -> List[tuple]:
+    """Return ``(name, module_info, candidates)`` for each module in a file.
+
+    Ports are parsed from the whole module, so both ANSI headers and
+    Verilog-2001 declarations in the body are found.
+    """
+    with open(filepath, 'r') as f:
+        content = _COMMENT.sub(' ', f.read())
+
+    found = []
+    for match in _MODULE_BLOCK.finditer(content):
+        name, rest = match.group(1), match.group(2)
+        header, _, body = rest.partition(';')
+        candidates, declarations = _scan_instances(body)
+        if '(' in header:
+            module_info = parse_module_text(f"module {name}{header};{declarations}")
+        else:
+            module_info = ModuleInfo(name=name, ports=[], params=[])
+        found.append((name, module_info, candidates))
+    return found
+
+
+def build_graph(filepaths: Iterable[str]) -> InstanceGraph:
+    """Build the instantiation graph of all modules defined in ``filepaths``.
+
+    Each file is read and scanned once. Instantiations of modules that are
+    not defined in any of the files (library cells, primitives) are dropped.
+
+    Raises:
+        RuntimeError: If a file is missing or a module is defined twice.
+    """
+    graph = InstanceGraph()
+    pending: Dict[str, List[Instance]] = {}
+    for filepath in filepaths:
+        if not filepath.endswith(('.v', '.sv')):
+            raise RuntimeError("Invalid file extension. Only .v and .sv are supported.")
+        if not Path(filepath).is_file():
+            raise RuntimeError(f"File not found: {filepath}")
+        for name, module_info, candidates in _scan_file(filepath):
+            if name in graph.modules:
+                raise RuntimeError(
+                    f"Module {name} defined in both {graph.sources[name]} and {filepath}"
+                )
+            graph.modules[name] = module_info
+            graph.sources[name] = filepath
+            pending[name] = candidates
+
+    for name, candidates in pending.items():
+        graph.instances[name] = [inst for inst in candidates if inst.module in graph.modules]
+    return graph
+
+
+def generate_hierarchy(graph: InstanceGraph, tops: Union[str, Iterable[str]], out_dir: str,
+                       template_dir: Optional[str] = None, jobs: Optional[int] = None,
+                       timings: Optional[Dict[str, float]] = None,
+                       **options) -> Dict[str, List[str]]:
+    """Generate testbenches for one or more tops and every module below them.
+
+    Each distinct module gets its regular testbench exactly once, even when
+    several tops share it, rendered in parallel since blocks do not depend
+    on each other's output. Every module that
+    instantiates others also gets a ``<name>_top_env.sv`` whose environment
+    holds one component per instance: the agent of a leaf block, or the
+    ``top_env`` of a block with its own sub-blocks. Leaf agents are given
+    their own config. The environment is compiled in ``<name>_top_pkg.sv``,
+    which imports the package of every sub-block. Extra keyword
+    arguments are generation options passed to :class:`UVMGenerator`.
+
+    Args:
+        graph: Instantiation graph of the design.
+        tops: Top module name, or several of them.
+        out_dir: Output directory.
+        template_dir: Custom template directory, defaults to the bundled templates.
+        jobs: Maximum number of modules rendered at once.
+        timings: If given, filled with the seconds spent on each module.
+
+    Returns:
+        Mapping from module name to its generated files, children before parents.
+    """
+    template_dir = template_dir or str(Path(__file__).parent / "templates")
+    generator = UVMGenerator(template_dir, out_dir, **options)
+    order = graph.subtrees([tops] if isinstance(tops, str) else tops)
+    composite = {name for name in order if graph.instances.get(name)}
+
+    def render(name):
+        start = time.perf_counter()
+        module_info = graph.modules[name]
+        files = generator.generate_testbench(module_info)
+        if name in composite:
+            files += [generator.generate_component(
+                template_name, module_info,
+                instances=graph.instances[name], composite=composite,
+            ) for template_name in TOP_TEMPLATES]
+        if timings is not None:
+            timings[name] = time.perf_counter() - start
+        return name, files
+
+    with ThreadPoolExecutor(max_workers=jobs) as pool:
+        return dict(pool.map(render, order))
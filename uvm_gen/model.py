@@ -1,6 +1,9 @@
 """Data models for UVM testbench components."""
 from dataclasses import dataclass
-from typing import List, Any
+from typing import List, Any, Optional
+
+# Input port names recognised as the clock driving the interface clocking blocks
+CLOCK_PORT_NAMES = ("clk", "clock", "clk_i", "i_clk", "aclk")
 
 
 @dataclass
@@ -9,6 +12,7 @@ class Port:
     name: str
     direction: str  # "input", "output", or "inout"
     width: int = 1  # Default to 1-bit width
+    width_expr: Optional[str] = None  # Range as written in the RTL, e.g. "WIDTH-1:0"
 
 
 @dataclass
@@ -16,6 +20,7 @@ class Parameter:
     """Represents a module parameter with its default value."""
     name: str
     default: Any
+    expr: Optional[str] = None  # Default as written in the RTL when not a literal, e.g. "$clog2(WIDTH)"
 
 
 @dataclass
@@ -23,4 +28,30 @@ class ModuleInfo:
     """Represents the extracted information from a Verilog module."""
     name: str
     ports: List[Port]
-    params: List[Parameter] 
\ No newline at end of file
+    params: List[Parameter]
+
+    @property
+    def clock_port(self) -> Optional[str]:
+        """Name of the clock input, or None if no port looks like a clock."""
+        for port in self.ports:
+            if port.direction == "input" and port.name in CLOCK_PORT_NAMES:
+                return port.name
+        return None
+
+    @property
+    def driven_ports(self) -> List[Port]:
+        """Inputs driven by the testbench, excluding the clock."""
+        clock = self.clock_port
+        return [p for p in self.ports if p.direction == "input" and p.name != clock]
+
+    @property
+    def sampled_ports(self) -> List[Port]:
+        """Outputs and inouts sampled by the testbench."""
+        return [p for p in self.ports if p.direction != "input"]
+
+
+@dataclass
+class Instance:
+    """Represents an instantiation of one module inside another."""
+    module: str  # Name of the instantiated module
+    name: str  # Instance name
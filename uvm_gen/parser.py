@@ -1,8 +1,9 @@
 """RTL parser for Verilog/SystemVerilog modules."""
+import ast
 import os
 import re
 import math
-from typing import List
+from typing import Dict, List
 from uvm_gen.model import Port, Parameter as ModelParameter, ModuleInfo
 import warnings
 
@@ -33,6 +34,133 @@ def _parse_width(width_str: str) -> int:
     return 1
 
 
+_BINARY_OPS = {
+    ast.Add: lambda a, b: a + b,
+    ast.Sub: lambda a, b: a - b,
+    ast.Mult: lambda a, b: a * b,
+    ast.Div: lambda a, b: a // b,
+    ast.FloorDiv: lambda a, b: a // b,
+    ast.Mod: lambda a, b: a % b,
+    ast.Pow: lambda a, b: a ** b,
+    ast.LShift: lambda a, b: a << b,
+    ast.RShift: lambda a, b: a >> b,
+}
+
+_SIZED_LITERAL = re.compile(r"(?:\d+)?'[sS]?([dDhHbBoO])([0-9a-fA-F_]+)")
+_LITERAL_BASES = {'d': 10, 'h': 16, 'b': 2, 'o': 8}
+
+
+def _clog2(value: int) -> int:
+    return max(0, (value - 1).bit_length())
+
+
+def evaluate_expr(expr: str, params: Dict[str, int]) -> int:
+    """Evaluate an integer constant expression over parameter values."""
+    text = expr.replace('$clog2', 'clog2')
+    text = _SIZED_LITERAL.sub(
+        lambda m: str(int(m.group(2).replace('_', ''), _LITERAL_BASES[m.group(1).lower()])),
+        text,
+    )
+    try:
+        tree = ast.parse(text.strip(), mode='eval')
+    except SyntaxError:
+        raise RuntimeError(f"Could not parse expression {expr!r}")
+
+    def visit(node):
+        if isinstance(node, ast.Expression):
+            return visit(node.body)
+        if isinstance(node, ast.Constant) and isinstance(node.value, int):
+            return node.value
+        if isinstance(node, ast.Name):
+            if node.id not in params:
+                raise RuntimeError(f"Unknown parameter {node.id} in expression {expr!r}")
+            if not isinstance(params[node.id], int):
+                raise RuntimeError(f"Parameter {node.id} in expression {expr!r} is not an integer")
+            return params[node.id]
+        if isinstance(node, ast.BinOp) and type(node.op) in _BINARY_OPS:
+            return _BINARY_OPS[type(node.op)](visit(node.left), visit(node.right))
+        if isinstance(node, ast.UnaryOp) and isinstance(node.op, (ast.USub, ast.UAdd)):
+            value = visit(node.operand)
+            return -value if isinstance(node.op, ast.USub) else value
+        if (isinstance(node, ast.Call) and isinstance(node.func, ast.Name)
+                and node.func.id == 'clog2' and len(node.args) == 1):
+            return _clog2(visit(node.args[0]))
+        raise RuntimeError(f"Unsupported construct in expression {expr!r}")
+
+    return visit(tree)
+
+
+def evaluate_width(width_expr: str, params: Dict[str, int]) -> int:
+    """Evaluate a port range like 'WIDTH-1:0' for the given parameter values."""
+    if not width_expr:
+        return 1
+    if ':' not in width_expr:
+        raise RuntimeError(f"Width expression {width_expr!r} is not a range")
+    msb, lsb = width_expr.split(':', 1)
+    return abs(evaluate_expr(msb, params) - evaluate_expr(lsb, params)) + 1
+
+
+_PARAM_START = re.compile(
+    r'\bparameter\s+(?:(?:integer|int|logic|bit|real|string|signed|unsigned)\s+)*(?:\[[^\]]*\]\s*)?'
+)
+_PARAM_NAME = re.compile(r'\s*(\w+)\s*=\s*')
+
+
+def _scan_expr(content: str, pos: int) -> int:
+    """Return the end of the expression starting at ``pos``.
+
+    The expression ends at the first ``,``, ``;`` or ``)`` outside brackets.
+    """
+    depth = 0
+    while pos < len(content):
+        char = content[pos]
+        if char in '([{':
+            depth += 1
+        elif char in ')]}':
+            if depth == 0:
+                break
+            depth -= 1
+        elif char in ',;' and depth == 0:
+            break
+        pos += 1
+    return pos
+
+
+def _parse_params(content: str) -> List[ModelParameter]:
+    """Extract parameters and their defaults, in declaration order.
+
+    A literal default is stored as an int. Any other default keeps its
+    expression in ``expr`` and is evaluated against the parameters declared
+    before it; if that fails, the expression text is used as the default.
+    ``parameter A = 1, B = A * 2`` lists declare every name.
+    """
+    params: List[ModelParameter] = []
+    values: Dict[str, int] = {}
+    for start in _PARAM_START.finditer(content):
+        pos = start.end()
+        while True:
+            match = _PARAM_NAME.match(content, pos)
+            if not match:
+                break
+            end = _scan_expr(content, match.end())
+            name, text = match.group(1), content[match.end():end].strip()
+            if re.fullmatch(r'\d+', text):
+                param = ModelParameter(name=name, default=int(text))
+            else:
+                try:
+                    param = ModelParameter(name=name, default=evaluate_expr(text, values), expr=text)
+                except RuntimeError:
+                    param = ModelParameter(name=name, default=text, expr=text)
+            params.append(param)
+            if isinstance(param.default, int):
+                values[name] = param.default
+            # A comma may continue the list with another NAME = value
+            if content[end:end + 1] != ',':
+                break
+            pos = end + 1
+    return params
+
+
 def parse_rtl(filepath: str) -> ModuleInfo:
     """Parse a Verilog/SystemVerilog file and extract module information."""
     if not filepath.endswith(('.v', '.sv')):
@@ -43,19 +171,18 @@ def parse_rtl(filepath: str) -> ModuleInfo:
     with open(filepath, 'r') as f:
         content = f.read()
 
+    return parse_module_text(content)
+
+
+def parse_module_text(content: str) -> ModuleInfo:
+    """Extract module information from Verilog/SystemVerilog source text."""
     # Extract module name
     module_match = re.search(r'module\s+(\w+)\s*#?\s*\(', content)
     if not module_match:
         raise RuntimeError("No module definition found")
     module_name = module_match.group(1)
 
-    # Extract parameters
-    params = []
-    param_matches = re.finditer(r'parameter\s+(\w+)\s*=\s*(\d+)', content)
-    for match in param_matches:
-        name = match.group(1)
-        default = int(match.group(2))
-        params.append(ModelParameter(name=name, default=default))
+    params = _parse_params(content)
 
     # Extract ports
     ports = []
@@ -68,6 +195,6 @@ def parse_rtl(filepath: str) -> ModuleInfo:
         width_str = match.group(2)
         name = match.group(3)
         width = _parse_width(width_str)
-        ports.append(Port(name=name, direction=direction, width=width))
+        ports.append(Port(name=name, direction=direction, width=width, width_expr=width_str))
 
     return ModuleInfo(name=module_name, ports=ports, params=params) 
\ No newline at end of file
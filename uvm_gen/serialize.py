@@ -0,0 +1,276 @@
+"""Import and export of ModuleInfo, so trusted port descriptions can skip parsing.
+
+Two interchangeable formats are supported, both streamed one module at a time
+so files describing thousands of modules never have to be held in memory.
+
+JSON Lines (version 2)
+    One JSON object per line::
+
+        {"format": "uvm-gen-module", "version": 2, "name": "adder",
+         "ports": [{"name": "a", "direction": "input", "width": 8,
+                    "width_expr": "AW-1:0"}, ...],
+         "params": [{"name": "WIDTH", "default": 8},
+                    {"name": "AW", "default": 3, "expr": "$clog2(WIDTH)"}, ...]}
+
+    ``width`` defaults to 1, must be at least 1 and fit a ``u32``, and
+    ``width_expr`` and ``expr`` may be omitted. Blank lines are ignored.
+
+Binary (version 2)
+    The 8-byte magic ``UVMGMOD\\0`` and a little-endian ``u16`` version,
+    followed by one record per module: a ``u32`` byte length and the payload.
+    The payload holds the name, a ``u32`` port count and per port its name,
+    a ``u8`` direction code (0 input, 1 output, 2 inout), a ``u32`` width and
+    the width expression; then a ``u32`` parameter count and per parameter
+    its name, its default encoded as JSON text and its default expression.
+    Strings are a ``u16`` byte length and UTF-8 data, with length ``0xFFFF``
+    meaning "absent".
+
+Version 1 files, which have no parameter expressions, are still read.
+"""
+
+import json
+import struct
+from typing import Iterable, Iterator, Optional
+
+from uvm_gen.model import ModuleInfo, Parameter, Port
+
+FORMAT_NAME = "uvm-gen-module"
+FORMAT_VERSION = 2
+# Versions that can still be read; version 1 lacks parameter expressions
+READ_VERSIONS = (1, 2)
+BINARY_MAGIC = b"UVMGMOD\0"
+
+_DIRECTIONS = ("input", "output", "inout")
+_ABSENT = 0xFFFF
+_MAX_WIDTH = 0xFFFFFFFF
+_U16 = struct.Struct("<H")
+_U32 = struct.Struct("<I")
+_PORT = struct.Struct("<BI")
+
+
+def module_to_dict(module_info: ModuleInfo) -> dict:
+    """Return the JSON Lines record for a module."""
+    ports = []
+    for port in module_info.ports:
+        record = {"name": port.name, "direction": port.direction, "width": port.width}
+        if port.width_expr is not None:
+            record["width_expr"] = port.width_expr
+        ports.append(record)
+    return {
+        "format": FORMAT_NAME,
+        "version": FORMAT_VERSION,
+        "name": module_info.name,
+        "ports": ports,
+        "params": [dict({"name": p.name, "default": p.default},
+                        **({"expr": p.expr} if p.expr is not None else {}))
+                   for p in module_info.params],
+    }
+
+
+def module_from_dict(record: dict) -> ModuleInfo:
+    """Build a module from a JSON Lines record.
+
+    Raises:
+        RuntimeError: If the record is not a supported module description.
+    """
+    if record.get("format") != FORMAT_NAME:
+        raise RuntimeError(f"Not a {FORMAT_NAME} record")
+    if record.get("version") not in READ_VERSIONS:
+        raise RuntimeError(f"Unsupported model version {record.get('version')!r}")
+    try:
+        ports = []
+        for port in record["ports"]:
+            if port["direction"] not in _DIRECTIONS:
+                raise RuntimeError(f"Invalid direction {port['direction']!r} for port {port['name']}")
+            width = int(port.get("width", 1))
+            if not 1 <= width <= _MAX_WIDTH:
+                raise RuntimeError(f"Malformed module record: invalid width {width} for port {port['name']}")
+            ports.append(Port(name=port["name"], direction=port["direction"],
+                              width=width, width_expr=port.get("width_expr")))
+        params = [Parameter(name=p["name"], default=p["default"], expr=p.get("expr"))
+                  for p in record.get("params", [])]
+        return ModuleInfo(name=record["name"], ports=ports, params=params)
+    except (KeyError, TypeError, ValueError) as e:
+        raise RuntimeError(f"Malformed module record: {e}")
+
+
+def _pack_str(value: Optional[str]) -> bytes:
+    if value is None:
+        return _U16.pack(_ABSENT)
+    data = value.encode("utf-8")
+    if len(data) >= _ABSENT:
+        raise RuntimeError(f"String too long for binary model: {value[:32]}...")
+    return _U16.pack(len(data)) + data
+
+
+def _unpack_str(payload: bytes, offset: int):
+    (length,) = _U16.unpack_from(payload, offset)
+    offset += _U16.size
+    if length == _ABSENT:
+        return None, offset
+    return payload[offset:offset + length].decode("utf-8"), offset + length
+
+
+def module_to_bytes(module_info: ModuleInfo) -> bytes:
+    """Return the binary record payload for a module, without its length prefix."""
+    parts = [_pack_str(module_info.name), _U32.pack(len(module_info.ports))]
+    for port in module_info.ports:
+        if port.direction not in _DIRECTIONS or not 1 <= port.width <= _MAX_WIDTH:
+            raise RuntimeError(f"Malformed module record: cannot encode port {port.name} "
+                               f"({port.direction}, width {port.width})")
+        parts.append(_pack_str(port.name))
+        parts.append(_PORT.pack(_DIRECTIONS.index(port.direction), port.width))
+        parts.append(_pack_str(port.width_expr))
+    parts.append(_U32.pack(len(module_info.params)))
+    for param in module_info.params:
+        parts.append(_pack_str(param.name))
+        parts.append(_pack_str(json.dumps(param.default)))
+        parts.append(_pack_str(param.expr))
+    return b"".join(parts)
+
+
+def module_from_bytes(payload: bytes, version: int = FORMAT_VERSION) -> ModuleInfo:
+    """Build a module from a binary record payload.
+
+    Args:
+        payload: Record payload, without its length prefix.
+        version: Format version of the file the record comes from.
+
+    Raises:
+        RuntimeError: If the payload is truncated or malformed.
+    """
+    try:
+        name, offset = _unpack_str(payload, 0)
+        (num_ports,) = _U32.unpack_from(payload, offset)
+        offset += _U32.size
+        ports = []
+        for _ in range(num_ports):
+            port_name, offset = _unpack_str(payload, offset)
+            direction, width = _PORT.unpack_from(payload, offset)
+            offset += _PORT.size
+            if direction >= len(_DIRECTIONS):
+                raise RuntimeError(f"Malformed binary module record: invalid direction code {direction}")
+            if width < 1:
+                raise RuntimeError(f"Malformed binary module record: invalid width {width}")
+            width_expr, offset = _unpack_str(payload, offset)
+            ports.append(Port(name=port_name, direction=_DIRECTIONS[direction],
+                              width=width, width_expr=width_expr))
+        (num_params,) = _U32.unpack_from(payload, offset)
+        offset += _U32.size
+        params = []
+        for _ in range(num_params):
+            param_name, offset = _unpack_str(payload, offset)
+            default, offset = _unpack_str(payload, offset)
+            expr = None
+            if version >= 2:
+                expr, offset = _unpack_str(payload, offset)
+            params.append(Parameter(name=param_name, default=json.loads(default), expr=expr))
+    except (struct.error, IndexError, TypeError, ValueError) as e:
+        raise RuntimeError(f"Malformed binary module record: {e}")
+    if offset != len(payload):
+        raise RuntimeError("Malformed binary module record: trailing data")
+    return ModuleInfo(name=name, ports=ports, params=params)
+
+
+class ModuleWriter:
+    """Incremental writer for a model file.
+
+    Use as a context manager and call :meth:`write` once per module, so
+    modules can be exported as they are produced.
+    """
+
+    def __init__(self, path: str, binary: bool = False):
+        """Open ``path`` for writing.
+
+        Args:
+            path: Output file.
+            binary: Write the compact binary form instead of JSON Lines.
+        """
+        self.binary = binary
+        self.count = 0
+        if binary:
+            self._file = open(path, "wb")
+            self._file.write(BINARY_MAGIC + _U16.pack(FORMAT_VERSION))
+        else:
+            self._file = open(path, "w")
+
+    def write(self, module_info: ModuleInfo):
+        """Append one module to the file."""
+        if self.binary:
+            payload = module_to_bytes(module_info)
+            self._file.write(_U32.pack(len(payload)))
+            self._file.write(payload)
+        else:
+            self._file.write(json.dumps(module_to_dict(module_info), separators=(",", ":")))
+            self._file.write("\n")
+        self.count += 1
+
+    def close(self):
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def write_modules(modules: Iterable[ModuleInfo], path: str, binary: bool = False) -> int:
+    """Write modules to ``path`` one at a time.
+
+    Args:
+        modules: Modules to write; may be a generator.
+        path: Output file.
+        binary: Write the compact binary form instead of JSON Lines.
+
+    Returns:
+        Number of modules written.
+    """
+    with ModuleWriter(path, binary) as writer:
+        for module_info in modules:
+            writer.write(module_info)
+    return writer.count
+
+
+def read_modules(path: str) -> Iterator[ModuleInfo]:
+    """Yield the modules stored in ``path`` one at a time.
+
+    The format is detected from the file contents.
+
+    Raises:
+        RuntimeError: If the file is missing or holds a malformed record.
+    """
+    try:
+        f = open(path, "rb")
+    except OSError as e:
+        raise RuntimeError(f"Cannot open model file {path}: {e}")
+    with f:
+        if f.read(len(BINARY_MAGIC)) == BINARY_MAGIC:
+            header = f.read(_U16.size)
+            if len(header) != _U16.size or _U16.unpack(header)[0] not in READ_VERSIONS:
+                raise RuntimeError(f"Unsupported binary model version in {path}")
+            (version,) = _U16.unpack(header)
+            while True:
+                prefix = f.read(_U32.size)
+                if not prefix:
+                    return
+                if len(prefix) != _U32.size:
+                    raise RuntimeError(f"Truncated binary model file {path}")
+                (length,) = _U32.unpack(prefix)
+                payload = f.read(length)
+                if len(payload) != length:
+                    raise RuntimeError(f"Truncated binary model file {path}")
+                yield module_from_bytes(payload, version)
+
+        f.seek(0)
+        for line_number, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+                if not isinstance(record, dict):
+                    raise RuntimeError("expected a JSON object")
+                module_info = module_from_dict(record)
+            except (ValueError, RuntimeError) as e:
+                raise RuntimeError(f"{path}:{line_number}: {e}")
+            yield module_info
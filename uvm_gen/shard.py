@@ -0,0 +1,202 @@
+"""Deterministic sharding of batch generation across machines.
+
+A batch run is split into ``COUNT`` shards so that every machine in a farm,
+given the same list of inputs, independently agrees on which inputs it owns.
+Each shard writes a manifest describing what it produced, and the manifests
+are merged afterwards into a single report.
+"""
+
+import hashlib
+import json
+import os
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence
+
+MANIFEST_VERSION = 1
+
+
+@dataclass(frozen=True)
+class ShardSpec:
+    """Represents the ``INDEX/COUNT`` selection of a single shard."""
+    index: int
+    count: int
+
+    def __str__(self) -> str:
+        return f"{self.index}/{self.count}"
+
+
+def parse_shard_spec(spec: str) -> ShardSpec:
+    """Parse a shard specification of the form ``INDEX/COUNT``.
+
+    Indices are zero-based, so ``0/4`` through ``3/4`` describe a four-way split.
+    """
+    parts = spec.strip().split("/")
+    if len(parts) != 2 or not all(part.strip().isdigit() for part in parts):
+        raise ValueError(f"Invalid shard specification {spec!r}: expected INDEX/COUNT")
+    index, count = int(parts[0]), int(parts[1])
+    if count < 1:
+        raise ValueError(f"Invalid shard specification {spec!r}: COUNT must be at least 1")
+    if index >= count:
+        raise ValueError(f"Invalid shard specification {spec!r}: INDEX must be below COUNT")
+    return ShardSpec(index=index, count=count)
+
+
+def stable_hash(key: str) -> int:
+    """Return a hash of ``key`` that is identical across processes and hosts."""
+    return int.from_bytes(hashlib.sha1(key.encode("utf-8")).digest()[:8], "big")
+
+
+def shard_owns(shard: ShardSpec, key: str) -> bool:
+    """Return True if ``key`` belongs to ``shard`` under unweighted partitioning.
+
+    This needs no knowledge of the other keys, so it can filter a stream.
+    """
+    return stable_hash(key) % shard.count == shard.index
+
+
+def partition(keys: Sequence[str], count: int,
+              weights: Optional[Dict[str, int]] = None) -> List[List[str]]:
+    """Split ``keys`` into ``count`` deterministic buckets.
+
+    Without weights each key goes to the bucket chosen by its stable hash.
+    With weights, keys are placed heaviest first into the currently lightest
+    bucket so that shards finish at roughly the same time; ties are broken by
+    the stable hash, so the result only depends on the keys and their weights.
+    """
+    buckets: List[List[str]] = [[] for _ in range(count)]
+    unique_keys = sorted(set(keys))
+    if weights is None:
+        for key in unique_keys:
+            buckets[stable_hash(key) % count].append(key)  # same rule as shard_owns
+        return buckets
+
+    loads = [0] * count
+    ordered = sorted(unique_keys, key=lambda k: (-weights.get(k, 0), stable_hash(k), k))
+    for key in ordered:
+        target = min(range(count), key=lambda i: (loads[i], i))
+        buckets[target].append(key)
+        loads[target] += weights.get(key, 0)
+    for bucket in buckets:
+        bucket.sort()
+    return buckets
+
+
+def select_shard(keys: Sequence[str], shard: ShardSpec,
+                 weights: Optional[Dict[str, int]] = None) -> List[str]:
+    """Return the subset of ``keys`` owned by ``shard``, in input order."""
+    owned = set(partition(keys, shard.count, weights)[shard.index])
+    seen = set()
+    selected = []
+    for key in keys:
+        if key in owned and key not in seen:
+            seen.add(key)
+            selected.append(key)
+    return selected
+
+
+def file_size_weights(paths: Sequence[str]) -> Dict[str, int]:
+    """Weight each input file by its size in bytes."""
+    return {path: os.path.getsize(path) for path in paths}
+
+
+def build_manifest(shard: Optional[ShardSpec], inputs: Sequence[str],
+                   assigned: Sequence[str], entries: List[dict]) -> dict:
+    """Build the manifest written by a single shard.
+
+    Args:
+        shard: Shard that produced the entries, or None for an unsharded run.
+        inputs: Every input known to the batch, across all shards.
+        assigned: Inputs owned by this shard.
+        entries: One record per generated module, holding the ``input``,
+            ``module`` name, generated ``files`` and elapsed ``seconds``.
+    """
+    return {
+        "version": MANIFEST_VERSION,
+        "shard": None if shard is None else {"index": shard.index, "count": shard.count},
+        "inputs": list(inputs),
+        "assigned": list(assigned),
+        "modules": entries,
+        "total_seconds": sum(entry["seconds"] for entry in entries),
+    }
+
+
+def write_manifest(manifest: dict, path: str):
+    """Write a manifest as JSON."""
+    with open(path, "w") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+        f.write("\n")
+
+
+def load_manifest(path: str) -> dict:
+    """Load a manifest written by :func:`write_manifest`.
+
+    Raises:
+        RuntimeError: If the file cannot be read or is not a supported manifest.
+    """
+    try:
+        with open(path, "r") as f:
+            manifest = json.load(f)
+    except (OSError, ValueError) as e:
+        raise RuntimeError(f"Cannot read manifest {path}: {e}")
+    if not isinstance(manifest, dict):
+        raise RuntimeError(f"Not a manifest: {path}")
+    if manifest.get("version") != MANIFEST_VERSION:
+        raise RuntimeError(
+            f"Unsupported manifest version {manifest.get('version')!r} in {path}"
+        )
+    return manifest
+
+
+def merge_manifests(manifests: List[dict]) -> dict:
+    """Combine shard manifests into a single report.
+
+    The report lists every generated module and flags problems with the
+    batch: inputs that no shard produced, modules produced more than once,
+    shard indices that are missing, and shards that disagree on the inputs
+    or on the shard count.
+    """
+    inputs: Dict[str, None] = {}
+    input_sets = set()
+    counts = set()
+    indices: Dict[int, int] = {}
+    modules = []
+    producers: Dict[str, List[str]] = {}
+    produced_inputs = set()
+
+    for manifest in manifests:
+        input_sets.add(tuple(sorted(manifest["inputs"])))
+        inputs.update(dict.fromkeys(manifest["inputs"]))
+        shard = manifest.get("shard")
+        label = "unsharded" if shard is None else f"{shard['index']}/{shard['count']}"
+        if shard is not None:
+            counts.add(shard["count"])
+            indices[shard["index"]] = indices.get(shard["index"], 0) + 1
+        for entry in manifest["modules"]:
+            modules.append(dict(entry, shard=label))
+            producers.setdefault(entry["module"], []).append(label)
+            produced_inputs.add(entry["input"])
+
+    missing_shards: List[int] = []
+    if len(counts) == 1:
+        count = next(iter(counts))
+        missing_shards = [i for i in range(count) if i not in indices]
+
+    return {
+        "version": MANIFEST_VERSION,
+        "modules": modules,
+        "total_seconds": sum(entry["seconds"] for entry in modules),
+        "missing": [item for item in inputs if item not in produced_inputs],
+        "duplicates": {name: shards for name, shards in sorted(producers.items())
+                       if len(shards) > 1},
+        "missing_shards": missing_shards,
+        "repeated_shards": sorted(i for i, n in indices.items() if n > 1),
+        "inconsistent_inputs": len(input_sets) > 1,
+        "shard_counts": sorted(counts) if len(counts) > 1 else [],
+    }
+
+
+def report_ok(report: dict) -> bool:
+    """Return True if a merged report describes a complete, duplicate-free batch."""
+    return not (report["missing"] or report["duplicates"] or report["missing_shards"]
+                or report["repeated_shards"] or report["inconsistent_inputs"]
+                or report["shard_counts"])
@@ -0,0 +1,273 @@
+"""Offline stimulus generation for file-driven sequences.
+
+Input vectors for a module are generated with NumPy, many at a time, and
+written to a compact binary file that the generated ``<name>_file_sequence``
+streams with ``$fread`` instead of calling ``randomize()`` per transaction.
+
+File format (version 1, all fields big-endian)
+    A 16-byte header: the magic ``UVMS``, then ``u32`` version, ``u32``
+    record size in bytes and ``u32`` record count. Each record is one
+    vector: the module's driven inputs (every input except the clock)
+    concatenated in port order with the first port in the most significant
+    bits, exactly as ``in_bus`` in the generated interface, zero-padded at
+    the top to a whole number of bytes.
+"""
+
+import os
+import struct
+from typing import Dict, List, Optional
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - exercised only without NumPy
+    np = None
+
+from uvm_gen.model import ModuleInfo, Port
+
+STIMULUS_MAGIC = b"UVMS"
+STIMULUS_VERSION = 1
+PATTERNS = ("random", "increment", "walking_ones", "zeros", "ones")
+
+_HEADER = struct.Struct(">4sIII")
+_MAX_RECORDS = 0xFFFFFFFF
+
+
+def _require_numpy():
+    if np is None:
+        raise RuntimeError("NumPy is required for stimulus generation")
+
+
+def record_bits(module_info: ModuleInfo) -> int:
+    """Number of meaningful bits in one stimulus record."""
+    return sum(port.width for port in module_info.driven_ports)
+
+
+def record_bytes(module_info: ModuleInfo) -> int:
+    """Size in bytes of one stimulus record."""
+    return (record_bits(module_info) + 7) // 8
+
+
+def restrict_constraints(constraints: Dict[str, dict], module_info: ModuleInfo) -> Dict[str, dict]:
+    """Return the constraints that apply to a module's driven inputs.
+
+    Lets one constraint file be used across a batch of modules with
+    different ports.
+    """
+    driven = {port.name for port in module_info.driven_ports}
+    return {name: constraint for name, constraint in constraints.items() if name in driven}
+
+
+def validate_constraints(module_info: ModuleInfo, constraints: Dict[str, dict],
+                         pattern: str = "random"):
+    """Check per-port constraints against a module's driven inputs.
+
+    Args:
+        module_info: Module the constraints apply to.
+        constraints: Per-port constraints, as for :func:`generate_vectors`.
+        pattern: Default pattern of ports without their own ``pattern``.
+
+    Raises:
+        RuntimeError: If a constraint names an unknown port, has unknown keys,
+            does not fit the port or mixes values with a non-random pattern.
+    """
+    ports = {port.name: port for port in module_info.driven_ports}
+    for name, constraint in constraints.items():
+        if name not in ports:
+            raise RuntimeError(f"Constraint on unknown or undriven port {name}")
+        if not isinstance(constraint, dict):
+            raise RuntimeError(f"Constraint for port {name} must be a mapping")
+        width = ports[name].width
+        unknown = set(constraint) - {"min", "max", "values", "pattern"}
+        if unknown:
+            raise RuntimeError(f"Unknown constraint keys for port {name}: {', '.join(sorted(unknown))}")
+        port_pattern = constraint.get("pattern", pattern)
+        if port_pattern not in PATTERNS:
+            raise RuntimeError(f"Unknown pattern {port_pattern!r} for port {name}")
+        valued = [k for k in ("min", "max", "values") if k in constraint]
+        if valued and port_pattern != "random":
+            raise RuntimeError(f"{'/'.join(valued)} on port {name} only apply to the random "
+                               f"pattern, not {port_pattern!r}")
+        bounded = [constraint[k] for k in ("min", "max") if k in constraint]
+        bounded += list(constraint.get("values", []))
+        if bounded and width > 64:
+            raise RuntimeError(f"Value constraints are only supported up to 64 bits (port {name})")
+        for value in bounded:
+            if not isinstance(value, int) or isinstance(value, bool):
+                raise RuntimeError(f"Constraint value {value!r} for port {name} is not an integer")
+            if not 0 <= value < (1 << width):
+                raise RuntimeError(f"Constraint value {value} does not fit {width}-bit port {name}")
+        if constraint.get("min", 0) > constraint.get("max", (1 << width) - 1):
+            raise RuntimeError(f"Empty range for port {name}")
+        if "values" in constraint and not constraint["values"]:
+            raise RuntimeError(f"Empty value set for port {name}")
+
+
+def _port_words(port: Port, count: int, start: int, pattern: str,
+                constraint: dict, rng) -> "np.ndarray":
+    """Return ``(count, words)`` uint64 values for a port, most significant word first."""
+    width = port.width
+    words = (width + 63) // 64
+    top_bits = width - 64 * (words - 1)
+    index = np.arange(start, start + count, dtype=np.uint64)
+
+    if "values" in constraint:
+        choices = np.asarray(constraint["values"], dtype=np.uint64)
+        return choices[rng.integers(0, len(choices), size=count)].reshape(count, 1)
+    if pattern == "random" and ("min" in constraint or "max" in constraint):
+        low = int(constraint.get("min", 0))
+        high = int(constraint.get("max", (1 << width) - 1))
+        return rng.integers(low, high, size=count, dtype=np.uint64, endpoint=True).reshape(count, 1)
+
+    if pattern == "random":
+        values = rng.integers(0, 1 << 64, size=(count, words), dtype=np.uint64)
+    elif pattern == "zeros":
+        values = np.zeros((count, words), dtype=np.uint64)
+    elif pattern == "ones":
+        values = np.full((count, words), np.iinfo(np.uint64).max, dtype=np.uint64)
+    elif pattern == "increment":
+        values = np.zeros((count, words), dtype=np.uint64)
+        values[:, -1] = index
+    else:  # walking_ones
+        bit = index % np.uint64(width)
+        values = np.zeros((count, words), dtype=np.uint64)
+        word = (words - 1 - bit // np.uint64(64)).astype(np.intp)
+        values[np.arange(count), word] = np.uint64(1) << (bit % np.uint64(64))
+    # Drop bits above the port width
+    if top_bits < 64:
+        values[:, 0] &= np.uint64((1 << top_bits) - 1)
+    return values
+
+
+def generate_vectors(module_info: ModuleInfo, count: int, pattern: str = "random",
+                     constraints: Optional[Dict[str, dict]] = None, seed: Optional[int] = None,
+                     start: int = 0, rng=None) -> "np.ndarray":
+    """Generate ``count`` packed input vectors for a module.
+
+    Args:
+        module_info: Module whose driven inputs are stimulated.
+        count: Number of vectors.
+        pattern: Default pattern for every port, one of ``PATTERNS``.
+        constraints: Per-port overrides, mapping a port name to a dict with
+            any of ``min``/``max`` (inclusive range for random values),
+            ``values`` (random choice from a list) or ``pattern``.
+        seed: Seed for a new random generator; ignored if ``rng`` is given.
+        start: Index of the first vector, used by the ``increment`` and
+            ``walking_ones`` patterns.
+        rng: NumPy random generator to draw from.
+
+    Returns:
+        ``(count, record_bytes)`` uint8 array, one record per row.
+
+    Raises:
+        RuntimeError: If NumPy is missing or a pattern or constraint is invalid.
+    """
+    _require_numpy()
+    constraints = constraints or {}
+    if pattern not in PATTERNS:
+        raise RuntimeError(f"Unknown pattern {pattern!r}, expected one of {', '.join(PATTERNS)}")
+    validate_constraints(module_info, constraints, pattern)
+    rng = rng if rng is not None else np.random.default_rng(seed)
+
+    ports = module_info.driven_ports
+    num_bytes = record_bytes(module_info)
+    if not ports:
+        return np.zeros((count, 0), dtype=np.uint8)
+    columns = []
+    for port in ports:
+        constraint = constraints.get(port.name, {})
+        columns.append(_port_words(port, count, start, constraint.get("pattern", pattern),
+                                   constraint, rng))
+
+    total = record_bits(module_info)
+    if total <= 64:
+        # Fast path: shift every port into one 64-bit word per vector
+        packed = columns[0][:, 0].copy()
+        for port, values in zip(ports[1:], columns[1:]):
+            packed = (packed << np.uint64(port.width)) | values[:, 0]
+        return packed.astype(">u8").view(np.uint8).reshape(count, 8)[:, 8 - num_bytes:]
+
+    # General path: expand every port to bits, concatenate and repack
+    bits = [np.zeros((count, num_bytes * 8 - total), dtype=np.uint8)]
+    for port, values in zip(ports, columns):
+        words = values.shape[1]
+        port_bits = np.unpackbits(values.astype(">u8").view(np.uint8).reshape(count, words * 8),
+                                  axis=1)
+        bits.append(port_bits[:, words * 64 - port.width:])
+    return np.packbits(np.concatenate(bits, axis=1), axis=1)
+
+
+def write_stimulus(path: str, module_info: ModuleInfo, count: int, pattern: str = "random",
+                   constraints: Optional[Dict[str, dict]] = None, seed: Optional[int] = None,
+                   chunk_size: int = 1 << 16) -> int:
+    """Generate ``count`` vectors and write them as a stimulus file.
+
+    Vectors are produced and written ``chunk_size`` at a time, so memory
+    use does not grow with ``count``. Arguments are validated before
+    anything is written, and the file only appears once it is complete.
+
+    Returns:
+        Size of one record in bytes.
+
+    Raises:
+        RuntimeError: If the module has no driven inputs, the count does not
+            fit the header, or generation fails.
+    """
+    _require_numpy()
+    num_bytes = record_bytes(module_info)
+    if num_bytes == 0:
+        raise RuntimeError(f"Module {module_info.name} has no inputs to stimulate")
+    if not 0 <= count <= _MAX_RECORDS:
+        raise RuntimeError(f"Vector count {count} out of range")
+    if pattern not in PATTERNS:
+        raise RuntimeError(f"Unknown pattern {pattern!r}, expected one of {', '.join(PATTERNS)}")
+    validate_constraints(module_info, constraints or {}, pattern)
+
+    # Written under a temporary name so a failure never leaves a file whose
+    # header promises records that are not there
+    tmp_path = f"{path}.tmp"
+    rng = np.random.default_rng(seed)
+    try:
+        with open(tmp_path, "wb") as f:
+            f.write(_HEADER.pack(STIMULUS_MAGIC, STIMULUS_VERSION, num_bytes, count))
+            for start in range(0, count, chunk_size):
+                chunk = generate_vectors(module_info, min(chunk_size, count - start), pattern,
+                                         constraints, start=start, rng=rng)
+                f.write(chunk.tobytes())
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    return num_bytes
+
+
+def read_stimulus(path: str, module_info: ModuleInfo) -> List[Dict[str, int]]:
+    """Decode a stimulus file back into per-port values.
+
+    Intended for inspection and testing; the simulator reads the file directly.
+
+    Raises:
+        RuntimeError: If the file does not match the module's record layout.
+    """
+    with open(path, "rb") as f:
+        header = f.read(_HEADER.size)
+        if len(header) != _HEADER.size:
+            raise RuntimeError(f"Truncated stimulus file {path}")
+        magic, version, num_bytes, count = _HEADER.unpack(header)
+        if magic != STIMULUS_MAGIC or version != STIMULUS_VERSION:
+            raise RuntimeError(f"Not a version {STIMULUS_VERSION} stimulus file: {path}")
+        if num_bytes != record_bytes(module_info):
+            raise RuntimeError(f"Record size {num_bytes} does not match module {module_info.name}")
+        data = f.read()
+    if len(data) != num_bytes * count:
+        raise RuntimeError(f"Truncated stimulus file {path}")
+
+    vectors = []
+    for i in range(count):
+        value = int.from_bytes(data[i * num_bytes:(i + 1) * num_bytes], "big")
+        fields = {}
+        for port in reversed(module_info.driven_ports):
+            fields[port.name] = value & ((1 << port.width) - 1)
+            value >>= port.width
+        vectors.append({port.name: fields[port.name] for port in module_info.driven_ports})
+    return vectors
@@ -0,0 +1,158 @@
+"""Parameter sweep generation.
+
+A sweep renders one testbench per combination of parameter values from a
+single parsed module. Port widths are re-evaluated from the range expressions
+recorded by the parser, and all variants share one set of compiled templates.
+"""
+
+import dataclasses
+import itertools
+import json
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+from uvm_gen.generator import UVMGenerator
+from uvm_gen.model import ModuleInfo, Parameter
+from uvm_gen.parser import evaluate_expr, evaluate_width
+
+ParamGrid = Dict[str, List[Any]]
+
+
+def parse_param_option(option: str) -> ParamGrid:
+    """Parse a command-line parameter option of the form ``NAME=V1,V2,...``."""
+    name, sep, values = option.partition('=')
+    name = name.strip()
+    if not sep or not name or not values.strip():
+        raise ValueError(f"Invalid parameter sweep {option!r}: expected NAME=V1,V2,...")
+    try:
+        return {name: [int(v.strip(), 0) for v in values.split(',')]}
+    except ValueError:
+        raise ValueError(f"Invalid parameter sweep {option!r}: values must be integers")
+
+
+def load_param_grid(path: str) -> ParamGrid:
+    """Load a parameter grid from a JSON or YAML file.
+
+    The file holds a mapping from parameter name to a list of values; a
+    scalar value is treated as a single-element list.
+    """
+    with open(path, 'r') as f:
+        text = f.read()
+    if path.endswith(('.yaml', '.yml')):
+        try:
+            import yaml
+        except ImportError:
+            raise RuntimeError("PyYAML is required to read YAML parameter grids")
+        data = yaml.safe_load(text)
+    else:
+        data = json.loads(text)
+    if not isinstance(data, dict):
+        raise RuntimeError(f"Parameter grid in {path} must be a mapping of name to values")
+    return {str(name): list(values) if isinstance(values, (list, tuple)) else [values]
+            for name, values in data.items()}
+
+
+def expand_grid(grid: ParamGrid) -> List[Dict[str, Any]]:
+    """Expand a grid into the list of all parameter combinations, in grid order."""
+    names = list(grid)
+    return [dict(zip(names, combo)) for combo in itertools.product(*(grid[n] for n in names))]
+
+
+def restrict_grid(grid: ParamGrid, module_info: ModuleInfo) -> ParamGrid:
+    """Return the part of a grid that applies to a module's declared parameters.
+
+    Lets one grid be used across a batch of modules that declare different
+    parameters.
+    """
+    known = {p.name for p in module_info.params}
+    return {name: values for name, values in grid.items() if name in known}
+
+
+def specialize(module_info: ModuleInfo, overrides: Dict[str, Any]) -> ModuleInfo:
+    """Return a copy of a module with parameter overrides applied.
+
+    Parameters whose default is an expression are re-evaluated from the
+    overridden values, then port widths written in terms of parameters are
+    re-evaluated; ports without a recorded range keep their parsed width.
+
+    Raises:
+        RuntimeError: If an override names an unknown parameter or a width
+            expression cannot be evaluated.
+    """
+    known = {p.name for p in module_info.params}
+    unknown = [name for name in overrides if name not in known]
+    if unknown:
+        raise RuntimeError(
+            f"Unknown parameter(s) for module {module_info.name}: {', '.join(unknown)}"
+        )
+    # Parameters are evaluated in declaration order, so one derived from an
+    # overridden parameter, e.g. AW = $clog2(WIDTH), follows the override
+    params = []
+    values: Dict[str, Any] = {}
+    for param in module_info.params:
+        if param.name in overrides:
+            param = Parameter(name=param.name, default=overrides[param.name])
+        elif param.expr is not None:
+            try:
+                param = dataclasses.replace(param, default=evaluate_expr(param.expr, values))
+            except RuntimeError:
+                # Not an integer expression; ports using it fail below
+                pass
+        params.append(param)
+        values[param.name] = param.default
+    ports = [
+        dataclasses.replace(port, width=evaluate_width(port.width_expr, values))
+        if port.width_expr else port
+        for port in module_info.ports
+    ]
+    return dataclasses.replace(module_info, ports=ports, params=params)
+
+
+def variant_name(overrides: Dict[str, Any]) -> str:
+    """Return the output directory name for a parameter combination."""
+    if not overrides:
+        return "default"
+    return "__".join(f"{name}_{value}" for name, value in overrides.items())
+
+
+def generate_sweep(module_info: ModuleInfo, grid: ParamGrid, out_dir: str,
+                   template_dir: Optional[str] = None,
+                   jobs: Optional[int] = None, **options) -> Dict[str, List[str]]:
+    """Generate one testbench per parameter combination.
+
+    Every variant is written to ``out_dir/<variant_name>``. Variants are
+    specialized up front, so an invalid combination fails before anything
+    is written, and then rendered in parallel by a thread pool sharing a
+    single generator and its compiled templates.
+
+    Args:
+        module_info: Parsed module to sweep.
+        grid: Mapping from parameter name to the values to sweep.
+        out_dir: Parent directory for the variant directories.
+        template_dir: Custom template directory, defaults to the bundled templates.
+        jobs: Maximum number of variants rendered at once.
+        **options: Generation options passed to :class:`UVMGenerator`.
+
+    Returns:
+        Mapping from variant directory to the list of generated files.
+    """
+    template_dir = template_dir or str(Path(__file__).parent / "templates")
+    generator = UVMGenerator(template_dir, out_dir, **options)
+    variants = [(Path(out_dir) / variant_name(combo), specialize(module_info, combo))
+                for combo in expand_grid(grid)]
+
+    def render(variant):
+        directory, module = variant
+        return str(directory), generator.generate_testbench(module, output_dir=str(directory))
+
+    with ThreadPoolExecutor(max_workers=jobs) as pool:
+        return dict(pool.map(render, variants))
+
+
+def merge_grids(grids: Iterable[ParamGrid]) -> ParamGrid:
+    """Merge several grids; later grids override earlier ones per parameter."""
+    merged: ParamGrid = {}
+    for grid in grids:
+        merged.update(grid)
+    return merged